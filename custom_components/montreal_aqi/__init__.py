@@ -2,20 +2,73 @@ from __future__ import annotations
 
 import logging
 import logging.handlers
+import queue
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from .const import CONF_STATION_ID, DOMAIN, PLATFORMS
+import voluptuous as vol
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    CONF_MAX_PARALLEL_FETCHES,
+    CONF_RECORD,
+    CONF_REPLAY,
+    CONF_REPLAY_LATENCY,
+    CONF_STALE_GRACE,
+    CONF_STATION_ID,
+    CONF_UPDATE_DEADLINE,
+    DATA_API,
+    DATA_FETCH_LIMIT,
+    DATA_LOGGING,
+    DATA_NETWORK,
+    DATA_TRANSPORT,
+    DEFAULT_MAX_PARALLEL_FETCHES,
+    DEFAULT_STALE_GRACE,
+    DEFAULT_UPDATE_DEADLINE,
+    DOMAIN,
+    PLATFORMS,
+)
 
 if TYPE_CHECKING:
+    from datetime import timedelta
+
     from homeassistant.config_entries import ConfigEntry
-    from homeassistant.core import HomeAssistant
+    from homeassistant.core import Event, HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
+
+    from .coordinator import MontrealAQINetworkCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+# Stations are set up from config entries; YAML only selects a transport
+# recording or replaying open data portal responses (offline runs, load tests)
+# and tunes how many blocking calls of the library client run in parallel
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Exclusive(CONF_RECORD, "transport"): cv.string,
+                vol.Exclusive(CONF_REPLAY, "transport"): cv.string,
+                vol.Optional(CONF_REPLAY_LATENCY, default=False): cv.boolean,
+                vol.Optional(
+                    CONF_MAX_PARALLEL_FETCHES, default=DEFAULT_MAX_PARALLEL_FETCHES
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+def _setup_file_logging(
+    hass: HomeAssistant,
+) -> tuple[logging.handlers.QueueHandler, logging.handlers.QueueListener]:
+    """Set up file logging for Montreal AQI.
 
-def _setup_file_logging(hass: HomeAssistant) -> logging.handlers.RotatingFileHandler:
-    """Set up file logging for Montreal AQI."""
+    Records are queued by the logger and written to the rotating file by a
+    background thread, so no disk I/O happens on the event loop.
+    """
     log_file = Path(hass.config.path("montreal_aqi.log"))
     file_handler = logging.handlers.RotatingFileHandler(
         log_file,
@@ -28,8 +81,133 @@ def _setup_file_logging(hass: HomeAssistant) -> logging.handlers.RotatingFileHan
             datefmt="%Y-%m-%d %H:%M:%S",
         )
     )
-    _LOGGER.addHandler(file_handler)
-    return file_handler
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    _LOGGER.addHandler(queue_handler)
+    return queue_handler, listener
+
+
+def _teardown_file_logging(
+    queue_handler: logging.handlers.QueueHandler,
+    listener: logging.handlers.QueueListener,
+) -> None:
+    """Stop file logging, flushing queued records."""
+    _LOGGER.removeHandler(queue_handler)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+async def _async_setup_file_logging(hass: HomeAssistant) -> None:
+    """Set up file logging once for the whole domain (non-blocking)."""
+    if DATA_LOGGING not in hass.data:
+        # Store the pending job so concurrent entry setups share it
+        hass.data[DATA_LOGGING] = hass.async_add_executor_job(_setup_file_logging, hass)
+    await hass.data[DATA_LOGGING]
+
+
+async def _async_teardown_file_logging(hass: HomeAssistant) -> None:
+    """Tear down domain file logging, if set up."""
+    if (pending := hass.data.pop(DATA_LOGGING, None)) is None:
+        return
+    queue_handler, listener = await pending
+    await hass.async_add_executor_job(_teardown_file_logging, queue_handler, listener)
+
+
+def _async_get_network(hass: HomeAssistant) -> MontrealAQINetworkCoordinator:
+    """Return the shared network coordinator, creating it on first use."""
+    if DATA_NETWORK not in hass.data:
+        from .api import async_get_api
+        from .coordinator import MontrealAQINetworkCoordinator
+
+        hass.data[DATA_NETWORK] = MontrealAQINetworkCoordinator(
+            hass, async_get_api(hass)
+        )
+    network: MontrealAQINetworkCoordinator = hass.data[DATA_NETWORK]
+    return network
+
+
+async def _async_release_station(hass: HomeAssistant, station_id: str) -> None:
+    """Remove a station from the network, shutting it down after the last one.
+
+    The pooled HTTP session and file logging are torn down along with the
+    network coordinator.
+    """
+    network: MontrealAQINetworkCoordinator | None = hass.data.get(DATA_NETWORK)
+    if network is None:
+        return
+
+    network.async_remove_station(station_id)
+    if not network.station_ids:
+        _LOGGER.debug("Last station removed, shutting down network coordinator")
+        hass.data.pop(DATA_NETWORK)
+        hass.data.pop(DATA_API, None)
+        await network.async_shutdown()
+
+        from .transport import async_close_session
+
+        await async_close_session(hass)
+        await _async_teardown_file_logging(hass)
+
+
+def _duration_option(entry: ConfigEntry, key: str, default: timedelta) -> timedelta:
+    """Return a duration set in the options of a config entry."""
+    if (value := entry.options.get(key)) is None:
+        return default
+    period: timedelta = cv.time_period_dict(value)
+    return period
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def _async_setup_transport(hass: HomeAssistant, conf: dict[str, Any]) -> None:
+    """Set up the transport recording or replaying portal responses."""
+    from .transport import AiohttpTransport, RecordingTransport, ReplayTransport
+
+    if CONF_REPLAY in conf:
+        path = Path(hass.config.path(conf[CONF_REPLAY]))
+        hass.data[DATA_TRANSPORT] = await ReplayTransport.async_from_file(
+            hass, path, conf[CONF_REPLAY_LATENCY]
+        )
+        _LOGGER.warning("Replaying open data portal responses from %s", path)
+    elif CONF_RECORD in conf:
+        path = Path(hass.config.path(conf[CONF_RECORD]))
+        recorder = RecordingTransport(hass, AiohttpTransport(hass), path)
+        hass.data[DATA_TRANSPORT] = recorder
+
+        async def _async_save_recording(_event: Event) -> None:
+            await recorder.async_save()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_save_recording)
+        _LOGGER.warning("Recording open data portal responses to %s", path)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Montreal AQI services and transport.
+
+    Args:
+        hass: Home Assistant instance
+        config: Home Assistant configuration
+
+    Returns:
+        True if setup was successful
+    """
+    from .api import ExecutorLimit
+    from .services import async_setup_services
+
+    if DOMAIN in config:
+        hass.data[DATA_FETCH_LIMIT] = ExecutorLimit(
+            config[DOMAIN][CONF_MAX_PARALLEL_FETCHES]
+        )
+        await _async_setup_transport(hass, config[DOMAIN])
+
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -42,35 +220,68 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     Returns:
         True if setup was successful
     """
-    # Set up file logging for Montreal AQI (non-blocking)
-    await hass.async_add_executor_job(_setup_file_logging, hass)
+    # Set up file logging for Montreal AQI (non-blocking, once per domain)
+    await _async_setup_file_logging(hass)
 
     _LOGGER.debug("Setting up entry %s", entry.entry_id)
 
-    from .api import MontrealAQIApi
     from .coordinator import MontrealAQICoordinator
+    from .storage import MontrealAQIRollingStore, MontrealAQISnapshotStore
+
+    station_id: str = entry.data[CONF_STATION_ID]
 
     try:
-        api = MontrealAQIApi(hass)
+        update_deadline = _duration_option(
+            entry, CONF_UPDATE_DEADLINE, DEFAULT_UPDATE_DEADLINE
+        )
+        network = _async_get_network(hass)
+        network.async_add_station(station_id, update_deadline)
 
+        snapshot_store = MontrealAQISnapshotStore(hass, station_id)
+        rolling_store = MontrealAQIRollingStore(hass, station_id)
         coordinator = MontrealAQICoordinator(
             hass=hass,
-            api=api,
-            station_id=entry.data[CONF_STATION_ID],
+            api=network.api,
+            station_id=station_id,
+            network=network,
+            snapshot_store=snapshot_store,
+            rolling_store=rolling_store,
+            update_deadline=update_deadline,
+            stale_grace=_duration_option(entry, CONF_STALE_GRACE, DEFAULT_STALE_GRACE),
         )
 
-        await coordinator.async_config_entry_first_refresh()
+        if (rolling := await rolling_store.async_load()) is not None:
+            coordinator.rolling = rolling
+
+        snapshot = await snapshot_store.async_load()
+        if snapshot is not None:
+            # Serve the last known data right away, refresh in the background
+            _LOGGER.debug("Restored snapshot for station %s", station_id)
+            coordinator.async_set_updated_data(snapshot)
+            entry.async_create_background_task(
+                hass,
+                coordinator.async_refresh(),
+                f"{DOMAIN} {station_id} initial refresh",
+            )
+        else:
+            await coordinator.async_config_entry_first_refresh()
+
+        entry.async_on_unload(
+            network.async_add_listener(coordinator.async_handle_network_update)
+        )
+        entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
         hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-        _LOGGER.debug("Setup completed for station %s", entry.data[CONF_STATION_ID])
+        _LOGGER.debug("Setup completed for station %s", station_id)
         return True
     except Exception as err:
         _LOGGER.error(
             "Failed to set up entry %s: %s", entry.entry_id, err, exc_info=True
         )
+        await _async_release_station(hass, station_id)
         raise
 
 
@@ -89,8 +300,23 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id, None)
+        await _async_release_station(hass, entry.data[CONF_STATION_ID])
         _LOGGER.debug("Entry %s unloaded successfully", entry.entry_id)
     else:
         _LOGGER.warning("Failed to unload platforms for entry %s", entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove data stored for a config entry.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry
+    """
+    from .storage import MontrealAQIRollingStore, MontrealAQISnapshotStore
+
+    station_id: str = entry.data[CONF_STATION_ID]
+    await MontrealAQISnapshotStore(hass, station_id).async_remove()
+    await MontrealAQIRollingStore(hass, station_id).async_remove()
@@ -1,28 +1,346 @@
 from __future__ import annotations
 
+import asyncio
+import copy
 import json
 import logging
-from typing import TYPE_CHECKING, Any, cast
+import time
+from contextlib import aclosing
+from datetime import date, datetime
+from enum import Enum, auto
+from typing import TYPE_CHECKING, Any, Final, cast
+from zoneinfo import ZoneInfo
+
+from homeassistant.core import callback
+from montreal_aqi_api import get_station_aqi, list_open_stations
+
+from .cache import TTLCache
+from .circuit import CircuitBreaker, CircuitOpenError
+from .const import (
+    API_REQUEST_LIMIT,
+    API_URL,
+    BACKFILL_PAGE_SIZE,
+    DATA_API,
+    DATA_FETCH_LIMIT,
+    DATA_TRANSPORT,
+    DATASTORE_PAGE_SIZE,
+    DEFAULT_MAX_PARALLEL_FETCHES,
+    DOMAIN,
+    FALLBACK_BATCH_LIMIT,
+    FALLBACK_BATCH_MAX_SIZE,
+    FALLBACK_BATCH_TTL,
+    FALLBACK_CACHE_MAX_SIZE,
+    FALLBACK_CACHE_TTL,
+    FALLBACK_NEGATIVE_CACHE_TTL,
+    POLLUTANT_ALIASES,
+    REFERENCE_VALUES,
+    RESOURCE_ID_AQI_HISTORY,
+    RESOURCE_ID_AQI_REALTIME,
+    RESOURCE_ID_STATIONS,
+    RSQA_TIMEZONE,
+    UPSTREAM_HISTORY,
+    UPSTREAM_REALTIME,
+)
+from .metrics import QueueWaitMetrics, measure_phase, record_phase
+from .transport import AiohttpTransport
 
 if TYPE_CHECKING:
+    from collections.abc import (
+        AsyncGenerator,
+        AsyncIterator,
+        Callable,
+        Coroutine,
+        Iterable,
+        Mapping,
+    )
+
+    import aiohttp
     from homeassistant.core import HomeAssistant
 
-import aiohttp
-from montreal_aqi_api import get_station_aqi, list_open_stations
+    from .transport import MontrealAQITransport
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class _Missing(Enum):
+    """Sentinel for values missing from a cache."""
+
+    MISSING = auto()
+
+
+_MISSING: Final = _Missing.MISSING
+
+# Columns needed to build station and fallback AQI data
+_AQI_FIELDS = ["stationId", "date", "heure", "pollutant", "valeur"]
+# Upstream circuit guarding each resource
+_RESOURCE_UPSTREAMS = {
+    RESOURCE_ID_STATIONS: UPSTREAM_REALTIME,
+    RESOURCE_ID_AQI_REALTIME: UPSTREAM_REALTIME,
+    RESOURCE_ID_AQI_HISTORY: UPSTREAM_HISTORY,
+}
+# Columns needed to build the station list
+_STATION_FIELDS = ["numero_station", "nom", "adresse", "arrondissement_ville"]
+
+
+class MontrealAQIApiError(Exception):
+    """Error to indicate the open data portal returned an invalid response."""
+
+
+class ExecutorLimit:
+    """Bound on the blocking library calls running at once in the domain.
+
+    Shared by every API client, so the integration's share of executor
+    threads stays the same however many clients and stations are set up.
+    """
+
+    def __init__(self, max_parallel_fetches: int) -> None:
+        """Initialize limit.
+
+        Args:
+            max_parallel_fetches: Blocking library calls run at the same time
+        """
+        self.max_parallel_fetches = max_parallel_fetches
+        self.slots = asyncio.Semaphore(max_parallel_fetches)
+        self.queue_wait = QueueWaitMetrics()
+
+
+@callback
+def async_get_executor_limit(hass: HomeAssistant) -> ExecutorLimit:
+    """Return the executor limit of the domain, creating the default one."""
+    limit: ExecutorLimit | None = hass.data.get(DATA_FETCH_LIMIT)
+    if limit is None:
+        limit = ExecutorLimit(DEFAULT_MAX_PARALLEL_FETCHES)
+        hass.data[DATA_FETCH_LIMIT] = limit
+    return limit
+
+
+@callback
+def async_get_api(hass: HomeAssistant) -> MontrealAQIApi:
+    """Return the API client shared by the domain, creating it on first use.
+
+    Sharing it lets config flows and coordinators reuse its caches, circuit
+    breakers and in-flight requests.
+    """
+    api: MontrealAQIApi | None = hass.data.get(DATA_API)
+    if api is None:
+        api = MontrealAQIApi(hass)
+        hass.data[DATA_API] = api
+    return api
+
+
 class MontrealAQIApi:
-    """Async wrapper for montreal-aqi-api library."""
+    """Async client for the Montreal open data RSQA datasets.
+
+    Data is fetched natively through a transport, aiohttp by default, which
+    can be swapped to record or replay responses. The synchronous
+    montreal-aqi-api library can still be used instead by passing
+    ``use_library=True``; it bypasses the transport.
+    """
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession | None = None,
+        use_library: bool = False,
+        transport: MontrealAQITransport | None = None,
+    ) -> None:
         """Initialize API wrapper.
 
         Args:
             hass: Home Assistant instance
+            session: aiohttp session to use, defaults to the integration's
+                pooled session
+            use_library: Fetch through the montreal-aqi-api library in the
+                executor instead of the native async client
+            transport: Transport performing the requests, defaults to the
+                transport configured for the domain, or aiohttp
         """
         self.hass = hass
+        if transport is None and session is None:
+            transport = hass.data.get(DATA_TRANSPORT)
+        self.transport = transport or AiohttpTransport(hass, session)
+        self.use_library = use_library
+        self.executor_limit = async_get_executor_limit(hass)
+        self.circuits = {
+            upstream: CircuitBreaker(upstream)
+            for upstream in (UPSTREAM_REALTIME, UPSTREAM_HISTORY)
+        }
+        self._in_flight: dict[tuple[str, ...], asyncio.Task[Any]] = {}
+        self._fallback_lock = asyncio.Lock()
+        self._fallback_cache: TTLCache[
+            tuple[str, str | None], dict[str, Any] | None
+        ] = TTLCache(FALLBACK_CACHE_MAX_SIZE)
+        self._fallback_batches: TTLCache[str | None, dict[str, dict[str, Any]]] = (
+            TTLCache(FALLBACK_BATCH_MAX_SIZE)
+        )
+
+    async def _async_single_flight[*Ts, T](
+        self,
+        key: tuple[str, ...],
+        target: Callable[[*Ts], Coroutine[Any, Any, T]],
+        *args: *Ts,
+    ) -> T:
+        """Run a request, or join the identical request already in flight.
+
+        Concurrent callers with the same key share a single request and its
+        result or error. The request runs in its own task, so cancelling one
+        caller does not cancel it for the others.
+
+        Args:
+            key: Operation name followed by its arguments
+            target: Coroutine function performing the request
+            *args: Arguments passed to target
+
+        Returns:
+            Shallow copy of the result of the request, so every caller,
+            including the one that started it, can amend it independently
+        """
+        task: asyncio.Task[T] | None = self._in_flight.get(key)
+        if task is None:
+            new_task = self.hass.async_create_task(
+                target(*args), f"{DOMAIN} request {' '.join(key)}"
+            )
+            self._in_flight[key] = new_task
+
+            @callback
+            def _async_done(_task: asyncio.Task[T]) -> None:
+                if self._in_flight.get(key) is new_task:
+                    del self._in_flight[key]
+
+            new_task.add_done_callback(_async_done)
+            task = new_task
+        else:
+            _LOGGER.debug("API: Joining in-flight request %s", key)
+        return copy.copy(await asyncio.shield(task))
+
+    async def _async_add_executor_job[*Ts, T](
+        self, target: Callable[[*Ts], T], *args: *Ts
+    ) -> T:
+        """Run a blocking library call in the executor, timing the queue wait.
+
+        At most max_parallel_fetches calls of the whole domain occupy executor
+        threads at once. The time waiting for a slot and a thread is recorded
+        as queue wait, the time running the job, which performs the library's
+        HTTP requests, as HTTP time. Library calls are guarded by the
+        real-time feed circuit breaker.
+
+        Blocking calls cannot be interrupted: if the caller is cancelled, the
+        job is abandoned and its result dropped, but it keeps its slot until
+        its thread is done.
+        """
+        limit = self.executor_limit
+        submitted = time.monotonic()
+        started: float | None = None
+
+        def _job() -> T:
+            nonlocal started
+            started = time.monotonic()
+            return target(*args)
+
+        @callback
+        def _async_release_slot(future: asyncio.Future[T]) -> None:
+            limit.slots.release()
+            if not future.cancelled() and future.exception() is not None:
+                # Retrieved here so abandoned jobs do not log unretrieved errors
+                _LOGGER.debug("API: executor job failed: %s", future.exception())
+
+        async with self.circuits[UPSTREAM_REALTIME].async_guard():
+            await limit.slots.acquire()
+            future = asyncio.ensure_future(self.hass.async_add_executor_job(_job))
+            future.add_done_callback(_async_release_slot)
+            result = await asyncio.shield(future)
+        if started is not None:
+            limit.queue_wait.record(started - submitted)
+            record_phase("executor_wait", started - submitted)
+            record_phase("http", time.monotonic() - started)
+        return result
+
+    async def _async_datastore_search(
+        self,
+        resource_id: str,
+        filters: Mapping[str, Any] | None = None,
+        fields: list[str] | None = None,
+        sort: str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Query a Ckan datastore resource and return its records.
+
+        Raises:
+            aiohttp.ClientError: If the request fails
+            MontrealAQIApiError: If the response is not a valid Ckan result
+        """
+        params: dict[str, str] = {"resource_id": resource_id}
+        if filters:
+            params["filters"] = json.dumps(filters)
+        if fields:
+            params["fields"] = ",".join(fields)
+        if sort:
+            params["sort"] = sort
+        if limit is not None:
+            params["limit"] = str(limit)
+        if offset:
+            params["offset"] = str(offset)
+
+        upstream = _RESOURCE_UPSTREAMS.get(resource_id, UPSTREAM_REALTIME)
+        async with self.circuits[upstream].async_guard():
+            with measure_phase("http"):
+                payload = await self.transport.async_get_json(API_URL, params)
+
+            if not isinstance(payload, dict) or not payload.get("success"):
+                raise MontrealAQIApiError(
+                    f"Ckan request on resource {resource_id} was not successful"
+                )
+
+            result = payload.get("result")
+            records = result.get("records") if isinstance(result, dict) else None
+            if not isinstance(records, list):
+                raise MontrealAQIApiError(
+                    f"Unexpected Ckan response format for resource {resource_id}"
+                )
+        return records
+
+    async def _async_iter_datastore(
+        self,
+        resource_id: str,
+        filters: Mapping[str, Any] | None = None,
+        fields: list[str] | None = None,
+        sort: str | None = None,
+        page_size: int = DATASTORE_PAGE_SIZE,
+        max_records: int | None = None,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """Yield the records of a Ckan datastore resource, page by page.
+
+        Pages are requested with offset/limit until a short page is returned
+        or max_records is reached. Only the current page is held in memory,
+        and closing the iterator early stops fetching further pages. The sort
+        must be a total order (end it with "_id") or records tied on the sort
+        keys may be skipped or repeated across pages.
+
+        Raises:
+            aiohttp.ClientError: If a request fails
+            MontrealAQIApiError: If a response is not a valid Ckan result
+        """
+        offset = 0
+        while max_records is None or offset < max_records:
+            limit = (
+                page_size
+                if max_records is None
+                else min(page_size, max_records - offset)
+            )
+            records = await self._async_datastore_search(
+                resource_id,
+                filters=filters,
+                fields=fields,
+                sort=sort,
+                limit=limit,
+                offset=offset,
+            )
+            offset += len(records)
+            for record in records:
+                yield record
+            if len(records) < limit:
+                return
 
     async def async_list_stations(self) -> list[dict[str, Any]]:
         """Fetch list of available monitoring stations.
@@ -33,9 +351,25 @@ class MontrealAQIApi:
         Raises:
             Exception: If API call fails
         """
+        return await self._async_single_flight(
+            ("list_stations",), self._async_list_stations
+        )
+
+    async def _async_list_stations(self) -> list[dict[str, Any]]:
+        """Fetch list of available monitoring stations."""
         _LOGGER.debug("API: Listing open stations")
         try:
-            stations = await self.hass.async_add_executor_job(list_open_stations)
+            if self.use_library:
+                stations = await self._async_add_executor_job(list_open_stations)
+            else:
+                stations = [
+                    _parse_station_record(record)
+                    async for record in self._async_iter_datastore(
+                        RESOURCE_ID_STATIONS,
+                        filters={"statut": "ouvert"},
+                        fields=_STATION_FIELDS,
+                    )
+                ]
             if not isinstance(stations, list):
                 _LOGGER.error(
                     "API: unexpected return type from list_open_stations: %s",
@@ -44,6 +378,8 @@ class MontrealAQIApi:
                 return []
             _LOGGER.debug("API: Retrieved %d stations", len(stations))
             return stations
+        except CircuitOpenError:
+            raise
         except Exception as err:
             _LOGGER.error("API: error listing stations: %s", err, exc_info=True)
             raise
@@ -61,22 +397,47 @@ class MontrealAQIApi:
         Raises:
             Exception: If API call fails
         """
+        return await self._async_single_flight(
+            ("station", station_id), self._async_get_station, station_id
+        )
+
+    async def _async_get_station(self, station_id: str) -> dict[str, Any] | None:
+        """Fetch AQI data for a specific station."""
         _LOGGER.debug("API: Fetching AQI for station %s", station_id)
         try:
-            station = await self.hass.async_add_executor_job(
-                get_station_aqi, station_id
-            )
-            if station is None:
+            if self.use_library:
+                station = await self._async_add_executor_job(
+                    get_station_aqi, station_id
+                )
+                station_dict = (
+                    cast("dict[str, Any]", station.to_dict())
+                    if station is not None
+                    else None
+                )
+            else:
+                records = [
+                    record
+                    async for record in self._async_iter_datastore(
+                        RESOURCE_ID_AQI_REALTIME,
+                        filters={"stationId": station_id},
+                        fields=_AQI_FIELDS,
+                    )
+                ]
+                with measure_phase("parse"):
+                    station_dict = _parse_station(station_id, records)
+
+            if station_dict is None:
                 _LOGGER.warning("API: station %s not found", station_id)
                 return None
 
-            station_dict = cast("dict[str, Any]", station.to_dict())
             _LOGGER.debug(
                 "API: Retrieved data for station %s (AQI: %s)",
                 station_id,
                 station_dict.get("aqi"),
             )
             return station_dict
+        except CircuitOpenError:
+            raise
         except Exception as err:
             _LOGGER.error(
                 "API: error fetching station %s: %s",
@@ -86,6 +447,72 @@ class MontrealAQIApi:
             )
             raise
 
+    async def async_get_stations(
+        self, station_ids: list[str]
+    ) -> dict[str, dict[str, Any] | None]:
+        """Fetch AQI data for several stations in a single update cycle.
+
+        Args:
+            station_ids: Station IDs (as strings)
+
+        Returns:
+            Dictionary mapping each station ID to its AQI data,
+            or None if the station was not found
+
+        Raises:
+            Exception: If API call fails
+        """
+        return await self._async_single_flight(
+            ("stations", *station_ids), self._async_get_stations, station_ids
+        )
+
+    async def _async_get_stations(
+        self, station_ids: list[str]
+    ) -> dict[str, dict[str, Any] | None]:
+        """Fetch AQI data for several stations in a single update cycle."""
+        _LOGGER.debug("API: Fetching AQI for %d stations", len(station_ids))
+        try:
+            if self.use_library:
+                stations = await self._async_add_executor_job(
+                    _get_stations_aqi, station_ids
+                )
+            else:
+                # One request for the whole network, split per station locally
+                by_station: dict[str, list[dict[str, Any]]] = {}
+                async for record in self._async_iter_datastore(
+                    RESOURCE_ID_AQI_REALTIME,
+                    filters={"stationId": station_ids},
+                    fields=_AQI_FIELDS,
+                    page_size=API_REQUEST_LIMIT,
+                ):
+                    by_station.setdefault(str(record.get("stationId")), []).append(
+                        record
+                    )
+                with measure_phase("parse"):
+                    stations = {
+                        station_id: _parse_station(
+                            station_id, by_station.get(station_id, [])
+                        )
+                        for station_id in station_ids
+                    }
+        except CircuitOpenError:
+            raise
+        except Exception as err:
+            _LOGGER.error(
+                "API: error fetching stations %s: %s",
+                station_ids,
+                err,
+                exc_info=True,
+            )
+            raise
+
+        _LOGGER.debug(
+            "API: Retrieved data for %d of %d stations",
+            sum(1 for station in stations.values() if station is not None),
+            len(station_ids),
+        )
+        return stations
+
     async def async_get_aqi_fallback(
         self, station_id: str, hour: str | None = None
     ) -> dict[str, Any] | None:
@@ -94,6 +521,10 @@ class MontrealAQIApi:
         This is used when detailed pollutant data is unavailable but we still want
         to provide an AQI value from the Montreal open data.
 
+        The latest hour of every station is fetched in one batched request,
+        shared by all stations needing a fallback. Results are cached per
+        station and hour; missing data and errors are cached for a shorter time.
+
         Args:
             station_id: Station ID (as string)
             hour: Hour to search for (0-23), or None to get the most recent
@@ -101,85 +532,302 @@ class MontrealAQIApi:
         Returns:
             Dictionary with 'aqi' and 'dominant_pollutant' keys
             or None if fallback data unavailable
+        """
+        key = (station_id, hour)
+        cached = self._fallback_cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            _LOGGER.debug(
+                "API: Using cached fallback AQI for station %s (hour: %s)",
+                station_id,
+                hour or "latest",
+            )
+            return dict(cached) if cached is not None else None
+
+        async with self._fallback_lock:
+            # Another station may have fetched the batch while we waited
+            cached = self._fallback_cache.get(key, _MISSING)
+            if cached is not _MISSING:
+                return dict(cached) if cached is not None else None
+
+            _LOGGER.debug(
+                "API: Fetching AQI fallback for station %s from Ckan (hour: %s)",
+                station_id,
+                hour or "latest",
+            )
+            try:
+                fallbacks = self._fallback_batches.get(hour, None)
+                if fallbacks is None:
+                    fallbacks = await self._async_fetch_fallback_batch(hour)
+            except Exception as err:
+                _LOGGER.warning(
+                    "API: error fetching fallback AQI for station %s: %s",
+                    station_id,
+                    err,
+                )
+                self._fallback_cache.set(key, None, FALLBACK_NEGATIVE_CACHE_TTL)
+                return None
+
+        fallback = fallbacks.get(station_id)
+        if fallback is None:
+            _LOGGER.warning(
+                "API: No fallback data found for station %s in Ckan",
+                station_id,
+            )
+            self._fallback_cache.set(key, None, FALLBACK_NEGATIVE_CACHE_TTL)
+            return None
+
+        _LOGGER.debug(
+            "API: Retrieved fallback AQI for station %s (AQI: %s, pollutant: %s)",
+            station_id,
+            fallback["aqi"],
+            fallback["dominant_pollutant"],
+        )
+        return dict(fallback)
+
+    async def _async_fetch_fallback_batch(
+        self, hour: str | None
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch fallback AQI of every station for an hour and cache it.
+
+        The batch is kept for FALLBACK_BATCH_TTL so stations missing from it
+        are not fetched again in the same cycle.
+        """
+        fallbacks = await _async_parse_fallback_records(
+            self._async_iter_datastore(
+                RESOURCE_ID_AQI_HISTORY,
+                filters={"heure": hour} if hour is not None else None,
+                fields=_AQI_FIELDS,
+                sort="date desc, heure desc, _id desc",
+                max_records=FALLBACK_BATCH_LIMIT,
+            )
+        )
+        self._fallback_batches.set(hour, fallbacks, FALLBACK_BATCH_TTL)
+        for station_id, fallback in fallbacks.items():
+            self._fallback_cache.set((station_id, hour), fallback, FALLBACK_CACHE_TTL)
+
+        _LOGGER.debug(
+            "API: Fetched fallback AQI batch for %d stations (hour: %s)",
+            len(fallbacks),
+            hour or "latest",
+        )
+        return fallbacks
+
+    async def async_get_station_history(
+        self, station_id: str, start: date, end: date
+    ) -> list[dict[str, Any]]:
+        """Fetch the hourly AQI history of a station over a date range.
+
+        The history resource is streamed from the most recent hour backwards,
+        BACKFILL_PAGE_SIZE records per page, until the start date is passed.
+
+        Args:
+            station_id: Station ID (as string)
+            start: First day to fetch (inclusive)
+            end: Last day to fetch (inclusive)
+
+        Returns:
+            Hourly station dictionaries in the format of async_get_station,
+            oldest first
 
         Raises:
             Exception: If API call fails
         """
         _LOGGER.debug(
-            "API: Fetching AQI fallback for station %s from Ckan (hour: %s)",
+            "API: Fetching history for station %s from %s to %s",
             station_id,
-            hour or "latest",
+            start,
+            end,
+        )
+        by_hour: dict[tuple[str, int], list[dict[str, Any]]] = {}
+        record_count = 0
+        async with aclosing(
+            self._async_iter_datastore(
+                RESOURCE_ID_AQI_HISTORY,
+                filters={"stationId": station_id},
+                fields=_AQI_FIELDS,
+                sort="date desc, heure desc, _id desc",
+                page_size=BACKFILL_PAGE_SIZE,
+            )
+        ) as records:
+            async for record in records:
+                record_count += 1
+                try:
+                    record_date = date.fromisoformat(str(record.get("date")))
+                except ValueError:
+                    continue
+                if record_date < start:
+                    # Sorted newest first: everything left is older
+                    break
+                hour = _parse_hour(record)
+                if hour is None or record_date > end:
+                    continue
+                by_hour.setdefault((record_date.isoformat(), hour), []).append(record)
+
+        history = [
+            station
+            for key in sorted(by_hour)
+            if (station := _parse_station(station_id, by_hour[key])) is not None
+        ]
+        _LOGGER.debug(
+            "API: Retrieved %d hours of history for station %s (%d records)",
+            len(history),
+            station_id,
+            record_count,
+        )
+        return history
+
+
+def _get_stations_aqi(station_ids: list[str]) -> dict[str, dict[str, Any] | None]:
+    """Fetch every station in one executor job (blocking)."""
+    stations: dict[str, dict[str, Any] | None] = {}
+    for station_id in station_ids:
+        station = get_station_aqi(station_id)
+        stations[station_id] = (
+            cast("dict[str, Any]", station.to_dict()) if station is not None else None
         )
+    return stations
+
+
+# -------------------------------------------------------------------
+# RSQA record parsing
+# -------------------------------------------------------------------
+
+
+def _parse_station_record(record: Mapping[str, Any]) -> dict[str, Any]:
+    """Convert a station list record to the station dictionary format."""
+    return {
+        "station_id": record.get("numero_station"),
+        "name": record.get("nom"),
+        "address": record.get("adresse"),
+        "borough": record.get("arrondissement_ville"),
+    }
+
+
+async def _async_parse_fallback_records(
+    records: AsyncIterator[Mapping[str, Any]],
+) -> dict[str, dict[str, Any]]:
+    """Return the latest fallback AQI of each station.
+
+    Records are sorted by date and hour (descending), so the first record of
+    a station gives its latest hour. The highest value of that hour is the
+    station AQI.
+    """
+    latest: dict[str, tuple[Any, Any]] = {}
+    fallbacks: dict[str, dict[str, Any]] = {}
+    async for record in records:
+        station_id = str(record.get("stationId"))
+        record_hour = (record.get("date"), record.get("heure"))
+        if latest.setdefault(station_id, record_hour) != record_hour:
+            continue
 
         try:
-            # Ckan datastore API endpoint
-            ckan_url = "https://donnees.montreal.ca/api/3/action/datastore_search"
-            resource_id = "6554355e-63d1-4a01-a268-91e0763c3606"
-
-            filters: dict[str, Any] = {"stationId": station_id}
-            if hour is not None:
-                filters["heure"] = hour
-
-            params: dict[str, Any] = {
-                "resource_id": resource_id,
-                "filters": json.dumps(filters),
-                "sort": "date desc, heure desc",
-                "limit": 50,
+            aqi_value = int(float(record.get("valeur", 0)))
+        except (TypeError, ValueError):
+            continue
+
+        existing = fallbacks.get(station_id)
+        if existing is None or aqi_value > existing["aqi"]:
+            fallbacks[station_id] = {
+                "aqi": aqi_value,
+                "dominant_pollutant": record.get("pollutant"),
             }
+    return fallbacks
 
-            async with (
-                aiohttp.ClientSession() as session,
-                session.get(
-                    ckan_url,
-                    params=params,  # type: ignore[arg-type]
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as resp,
-            ):
-                if resp.status != 200:
-                    _LOGGER.warning(
-                        "API: Ckan fallback returned status %d for station %s",
-                        resp.status,
-                        station_id,
-                    )
-                    return None
-                data = await resp.json()
 
-            if not data.get("success"):
-                _LOGGER.warning(
-                    "API: Ckan fallback request failed for station %s",
-                    station_id,
-                )
-                return None
+def _parse_hour(record: Mapping[str, Any]) -> int | None:
+    """Return the integer hour of a record, or None if invalid."""
+    try:
+        return int(record.get("heure"))  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
 
-            records = data.get("result", {}).get("records", [])
-            if not records:
-                _LOGGER.warning(
-                    "API: No fallback data found for station %s in Ckan",
-                    station_id,
-                )
-                return None
 
-            # Get the most recent record (already sorted by date desc, heure desc)
-            record = records[0]
-            aqi_value = int(float(record.get("valeur", 0)))
-            dominant_pollutant = record.get("pollutant")
+def _parse_pollutants(
+    records: Iterable[Mapping[str, Any]],
+) -> dict[str, dict[str, Any]]:
+    """Build pollutant sub-indices and estimated concentrations from records.
 
-            _LOGGER.debug(
-                "API: Retrieved fallback AQI for station %s (AQI: %s, pollutant: %s)",
-                station_id,
-                aqi_value,
-                dominant_pollutant,
-            )
+    When a pollutant appears several times, the highest sub-index is kept.
+    """
+    pollutants: dict[str, dict[str, Any]] = {}
+    for record in records:
+        code = record.get("pollutant")
+        raw_value = record.get("valeur")
+        if not isinstance(code, str):
+            continue
 
-            return {
-                "aqi": aqi_value,
-                "dominant_pollutant": dominant_pollutant,
+        try:
+            aqi = int(float(raw_value))  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            continue
+
+        code = POLLUTANT_ALIASES.get(code, code)
+        reference = REFERENCE_VALUES.get(code)
+        if reference is None:
+            continue
+
+        existing = pollutants.get(code)
+        if existing is None or aqi > existing["aqi"]:
+            pollutants[code] = {
+                "name": code,
+                "aqi": aqi,
+                "concentration": (aqi / 100.0) * float(reference["ref"]),
             }
+    return pollutants
 
-        except Exception as err:
-            _LOGGER.warning(
-                "API: error fetching fallback AQI for station %s: %s",
-                station_id,
-                err,
-            )
-            return None
+
+def _parse_station(
+    station_id: str, records: list[dict[str, Any]]
+) -> dict[str, Any] | None:
+    """Build station AQI data from its real-time records.
+
+    The output matches ``Station.to_dict()`` from the montreal-aqi-api library.
+
+    Returns:
+        Station dictionary, or None if no valid data is available
+    """
+    latest_hour = max(
+        (hour for hour in map(_parse_hour, records) if hour is not None),
+        default=None,
+    )
+    if latest_hour is None:
+        return None
+
+    latest_records = [r for r in records if _parse_hour(r) == latest_hour]
+    pollutants = _parse_pollutants(latest_records)
+    if not pollutants:
+        return None
+
+    raw_date = latest_records[0].get("date")
+    try:
+        station_date = date.fromisoformat(raw_date)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        _LOGGER.warning("API: invalid station metadata for station %s", station_id)
+        return None
+
+    timestamp = datetime(
+        station_date.year,
+        station_date.month,
+        station_date.day,
+        latest_hour,
+        tzinfo=ZoneInfo(RSQA_TIMEZONE),
+    )
+    # First pollutant with the highest sub-index is dominant
+    dominant = max(pollutants.items(), key=lambda item: item[1]["aqi"])[0]
+
+    return {
+        "station_id": station_id,
+        "date": station_date.isoformat(),
+        "hour": latest_hour,
+        "timestamp": timestamp.isoformat(),
+        "aqi": round(pollutants[dominant]["aqi"]),
+        "dominant_pollutant": dominant,
+        "pollutants": {
+            code: {
+                "name": pollutant["name"],
+                "aqi": round(pollutant["aqi"]),
+                "concentration": float(pollutant["concentration"]),
+            }
+            for code, pollutant in pollutants.items()
+        },
+    }
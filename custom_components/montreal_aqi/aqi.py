@@ -0,0 +1,89 @@
+"""Local computation of the Montreal AQI from pollutant measurements."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from .const import AQI_KEY_POLLUTANTS, MIN_REQUIRED_POLLUTANTS, REFERENCE_VALUES
+
+
+@dataclass(frozen=True, slots=True)
+class AQIResult:
+    """AQI computed from the pollutants of a station."""
+
+    aqi: int | None
+    dominant_pollutant: str | None
+    # Sub-index of each pollutant with a measurement
+    sub_indices: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def reliable(self) -> bool:
+        """Return True if missing pollutants are unlikely to change the AQI.
+
+        The AQI is the highest sub-index, so it is reliable with enough
+        pollutants, or when the pollutants driving the index are measured.
+        """
+        return len(self.sub_indices) >= MIN_REQUIRED_POLLUTANTS or all(
+            code in self.sub_indices for code in AQI_KEY_POLLUTANTS
+        )
+
+
+def sub_index(code: str, concentration: float) -> int | None:
+    """Return the sub-index of a pollutant concentration.
+
+    Args:
+        code: Pollutant code (e.g., 'PM2.5')
+        concentration: Concentration in the unit of its reference value
+
+    Returns:
+        Sub-index, or None if the pollutant has no reference value
+    """
+    if (reference := REFERENCE_VALUES.get(code)) is None:
+        return None
+    return round(concentration / reference["ref"] * 100)
+
+
+def compute_aqi(pollutants: Mapping[str, Any]) -> AQIResult:
+    """Compute the AQI and dominant pollutant from pollutant measurements.
+
+    Published sub-indices are used as is; otherwise the sub-index is computed
+    from the concentration and the pollutant's reference value.
+
+    Args:
+        pollutants: Pollutants as returned by the API, mapping each code to
+            its 'aqi' and 'concentration', or to a plain concentration
+
+    Returns:
+        Computed AQI, None without any measured pollutant
+    """
+    sub_indices: dict[str, int] = {}
+    for code, value in pollutants.items():
+        if isinstance(value, Mapping):
+            published = value.get("aqi")
+            concentration = value.get("concentration")
+        else:
+            published, concentration = None, value
+
+        index: int | None
+        try:
+            if published is not None:
+                index = round(float(published))
+            elif concentration is not None:
+                index = sub_index(code, float(concentration))
+            else:
+                continue
+        except (TypeError, ValueError):
+            continue
+        if index is not None:
+            sub_indices[code] = index
+
+    if not sub_indices:
+        return AQIResult(aqi=None, dominant_pollutant=None)
+
+    # First pollutant with the highest sub-index is dominant
+    dominant = max(sub_indices, key=sub_indices.__getitem__)
+    return AQIResult(
+        aqi=sub_indices[dominant], dominant_pollutant=dominant, sub_indices=sub_indices
+    )
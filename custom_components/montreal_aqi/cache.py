@@ -0,0 +1,56 @@
+"""In-memory caches for Montreal AQI."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datetime import timedelta
+
+
+class TTLCache[KT, VT]:
+    """Size-bounded LRU cache whose entries expire after a per-entry TTL.
+
+    Expired entries are dropped on access; when the cache is full, the
+    least recently used entry is evicted.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize cache.
+
+        Args:
+            max_size: Maximum number of entries kept
+        """
+        self.max_size = max_size
+        self._entries: OrderedDict[KT, tuple[float, VT]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of entries, including expired ones not yet dropped."""
+        return len(self._entries)
+
+    def get[T](self, key: KT, default: T) -> VT | T:
+        """Return the cached value for a key, or default if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: KT, value: VT, ttl: timedelta) -> None:
+        """Cache a value for the given time to live."""
+        self._entries[key] = (time.monotonic() + ttl.total_seconds(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
@@ -0,0 +1,133 @@
+"""Circuit breaker for the Montreal open data upstreams."""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from .const import (
+    CIRCUIT_BASE_DELAY,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MAX_DELAY,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CircuitState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Error to indicate a call was short-circuited by an open circuit."""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        """Initialize error.
+
+        Args:
+            name: Name of the upstream
+            retry_after: Seconds until the circuit lets a probe call through
+        """
+        super().__init__(
+            f"Circuit for upstream {name} is open, retrying in {retry_after:.0f}s"
+        )
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Stop calling an upstream after repeated failures.
+
+    After CIRCUIT_FAILURE_THRESHOLD consecutive failures the circuit opens
+    and calls fail fast. Once the backoff delay has passed, a single probe
+    call is let through (half-open): its success closes the circuit, its
+    failure opens it again with a doubled delay. Delays are jittered and
+    capped at CIRCUIT_MAX_DELAY.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize circuit breaker.
+
+        Args:
+            name: Name of the upstream, used in logs and errors
+        """
+        self.name = name
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._opened = 0
+        self._retry_at = 0.0
+
+    @property
+    def retry_after(self) -> float:
+        """Return the seconds left before a probe call is let through."""
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def _check(self) -> None:
+        """Raise if calls are currently short-circuited."""
+        if self.state is CircuitState.CLOSED:
+            return
+        if self.state is CircuitState.OPEN and not self.retry_after:
+            _LOGGER.debug("API: circuit for %s half-open, probing", self.name)
+            self.state = CircuitState.HALF_OPEN
+            return
+        # Open, or half-open with a probe already in flight
+        raise CircuitOpenError(self.name, self.retry_after)
+
+    def _record_success(self) -> None:
+        if self.state is not CircuitState.CLOSED:
+            _LOGGER.info("API: upstream %s recovered, circuit closed", self.name)
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._opened = 0
+
+    def _record_failure(self) -> None:
+        self.failures += 1
+        if (
+            self.state is CircuitState.HALF_OPEN
+            or self.failures >= CIRCUIT_FAILURE_THRESHOLD
+        ):
+            delay = min(
+                CIRCUIT_MAX_DELAY.total_seconds(),
+                CIRCUIT_BASE_DELAY.total_seconds() * 2**self._opened,
+            )
+            delay = random.uniform(delay / 2, delay)
+            self._opened += 1
+            self._retry_at = time.monotonic() + delay
+            self.state = CircuitState.OPEN
+            _LOGGER.warning(
+                "API: upstream %s failed %d times, circuit open for %.0fs",
+                self.name,
+                self.failures,
+                delay,
+            )
+
+    @asynccontextmanager
+    async def async_guard(self) -> AsyncIterator[None]:
+        """Guard a call to the upstream, recording its outcome.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        self._check()
+        try:
+            yield
+        except Exception:
+            self._record_failure()
+            raise
+        except BaseException:
+            # Cancelled probe: let the next call probe again
+            if self.state is CircuitState.HALF_OPEN:
+                self.state = CircuitState.OPEN
+            raise
+        self._record_success()
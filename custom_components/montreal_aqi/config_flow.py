@@ -4,16 +4,29 @@ import logging
 from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
-from homeassistant.config_entries import ConfigFlow
+from homeassistant.config_entries import ConfigFlow, OptionsFlow
+from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import selector
 from homeassistant.helpers.selector import SelectOptionDict
 
-from .api import MontrealAQIApi
-from .const import CONF_STATION_ID, DOMAIN
+from .api import async_get_api
+from .const import (
+    CONF_STALE_GRACE,
+    CONF_STATION_ID,
+    CONF_UPDATE_DEADLINE,
+    DEFAULT_STALE_GRACE,
+    DEFAULT_UPDATE_DEADLINE,
+    DOMAIN,
+)
+from .storage import MontrealAQIStationListStore
 
 if TYPE_CHECKING:
-    from homeassistant.config_entries import ConfigFlowResult
+    from datetime import timedelta
+
+    from homeassistant.config_entries import ConfigEntry, ConfigFlowResult
+    from homeassistant.core import HomeAssistant
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,6 +48,12 @@ class MontrealAQIConfigFlow(ConfigFlow, domain=DOMAIN):  # type: ignore[call-arg
         """Initialize config flow."""
         self._stations: dict[str, dict[str, Any]] = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> MontrealAQIOptionsFlow:
+        """Return the options flow of a config entry."""
+        return MontrealAQIOptionsFlow()
+
     async def async_step_user(
         self: MontrealAQIConfigFlow,
         user_input: dict[str, Any] | None = None,
@@ -66,23 +85,35 @@ class MontrealAQIConfigFlow(ConfigFlow, domain=DOMAIN):  # type: ignore[call-arg
                 data={CONF_STATION_ID: station_id},
             )
 
-        api = MontrealAQIApi(self.hass)
+        store = MontrealAQIStationListStore(self.hass)
+        cached = await store.async_load()
 
-        try:
-            stations = await api.async_list_stations()
-        except Exception as err:
-            _LOGGER.error(
-                "Config flow: cannot fetch stations: %s",
-                err,
-                exc_info=True,
-            )
-            return self.async_abort(reason="cannot_connect")
+        if cached is not None:
+            stations, fetched_at = cached
+            _LOGGER.debug("Config flow: using %d cached stations", len(stations))
+            if store.is_expired(fetched_at):
+                self.hass.async_create_background_task(
+                    _async_refresh_station_list(self.hass, store),
+                    f"{DOMAIN} station list refresh",
+                )
+        else:
+            try:
+                stations = await async_get_api(self.hass).async_list_stations()
+            except Exception as err:
+                _LOGGER.error(
+                    "Config flow: cannot fetch stations: %s",
+                    err,
+                    exc_info=True,
+                )
+                return self.async_abort(reason="cannot_connect")
 
-        if not stations:
-            _LOGGER.warning("Config flow: no stations available from API")
-            return self.async_abort(reason="no_stations")
+            if not stations:
+                _LOGGER.warning("Config flow: no stations available from API")
+                return self.async_abort(reason="no_stations")
 
-        self._stations = {s["station_id"]: s for s in stations}
+            await store.async_save(stations)
+
+        self._stations = {str(s["station_id"]): s for s in stations}
 
         # Sort stations by station_id (numeric) for consistent ordering
         options: list[SelectOptionDict] = [
@@ -111,3 +142,66 @@ class MontrealAQIConfigFlow(ConfigFlow, domain=DOMAIN):  # type: ignore[call-arg
                 }
             ),
         )
+
+
+class MontrealAQIOptionsFlow(OptionsFlow):
+    """Options flow tuning the update timing of a station."""
+
+    async def async_step_init(
+        self: MontrealAQIOptionsFlow,
+        user_input: dict[str, Any] | None = None,
+    ) -> ConfigFlowResult:
+        """Manage the update deadline and stale grace window of a station."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            errors = {
+                key: "invalid_duration"
+                for key in (CONF_UPDATE_DEADLINE, CONF_STALE_GRACE)
+                if not cv.time_period_dict(user_input[key]).total_seconds()
+            }
+            if not errors:
+                return self.async_create_entry(data=user_input)
+
+        entry = self.hass.config_entries.async_get_entry(self.handler)
+        options = dict(entry.options) if entry is not None else {}
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_UPDATE_DEADLINE,
+                        default=options.get(
+                            CONF_UPDATE_DEADLINE, _duration(DEFAULT_UPDATE_DEADLINE)
+                        ),
+                    ): selector.DurationSelector(),
+                    vol.Required(
+                        CONF_STALE_GRACE,
+                        default=options.get(
+                            CONF_STALE_GRACE, _duration(DEFAULT_STALE_GRACE)
+                        ),
+                    ): selector.DurationSelector(),
+                }
+            ),
+            errors=errors,
+        )
+
+
+def _duration(period: timedelta) -> dict[str, int]:
+    """Return a period in the format of a duration selector."""
+    minutes, seconds = divmod(int(period.total_seconds()), 60)
+    hours, minutes = divmod(minutes, 60)
+    return {"hours": hours, "minutes": minutes, "seconds": seconds}
+
+
+async def _async_refresh_station_list(
+    hass: HomeAssistant, store: MontrealAQIStationListStore
+) -> None:
+    """Refresh the cached station list in the background."""
+    try:
+        stations = await async_get_api(hass).async_list_stations()
+    except Exception as err:
+        _LOGGER.warning("Config flow: cannot refresh station list: %s", err)
+        return
+
+    if stations:
+        await store.async_save(stations)
@@ -14,19 +14,161 @@ from homeassistant.const import CONCENTRATION_MICROGRAMS_PER_CUBIC_METER
 DOMAIN = "montreal_aqi"
 PLATFORMS = ["sensor"]
 
+# hass.data keys for domain-wide shared objects
+DATA_API = f"{DOMAIN}_api"
+DATA_NETWORK = f"{DOMAIN}_network"
+DATA_SESSION = f"{DOMAIN}_session"
+DATA_SESSION_CLOSE_LISTENER = f"{DOMAIN}_session_close_listener"
+DATA_LOGGING = f"{DOMAIN}_logging"
+DATA_TRANSPORT = f"{DOMAIN}_transport"
+DATA_FETCH_LIMIT = f"{DOMAIN}_fetch_limit"
+
+# Persistent storage
+STORAGE_VERSION = 1
+STORAGE_KEY_STATIONS = f"{DOMAIN}.stations"
+STORAGE_KEY_SNAPSHOT = DOMAIN + ".snapshot.{station_id}"
+STORAGE_KEY_ROLLING = DOMAIN + ".rolling.{station_id}"
+
+# Delay before persisting a station snapshot after an update
+SNAPSHOT_SAVE_DELAY = timedelta(seconds=30)
+
+# Hourly concentrations kept per station and pollutant, and the rolling
+# windows (in hours) averaged over them
+ROLLING_HOURS = 24
+ROLLING_WINDOWS = (1, 8, 24)
+# Rolling sensors enabled by default: 8h ozone and 24h PM2.5 averages
+ROLLING_DEFAULT_SENSORS = {("O3", 8, "mean"), ("PM2.5", 24, "mean")}
+
+# Station list cached for the config flow is refreshed once older than this
+STATION_LIST_TTL = timedelta(days=1)
+
 # Configuration keys
 CONF_STATION_ID = "station_id"
 CONF_STATION_NAME = "station_name"
 
+# YAML keys recording or replaying open data portal responses
+CONF_RECORD = "record"
+CONF_REPLAY = "replay"
+CONF_REPLAY_LATENCY = "replay_latency"
+
+# YAML key bounding the blocking library calls run at the same time on the
+# shared executor, so many stations do not crowd out the recorder. Only the
+# montreal-aqi-api library client uses the executor
+CONF_MAX_PARALLEL_FETCHES = "max_parallel_fetches"
+DEFAULT_MAX_PARALLEL_FETCHES = 2
+
+# Option setting the time budget of a station update cycle, covering the
+# primary fetch and the fallback; overrunning cycles are abandoned. The shared
+# network fetch uses the longest budget of the configured stations
+CONF_UPDATE_DEADLINE = "update_deadline"
+DEFAULT_UPDATE_DEADLINE = timedelta(seconds=30)
+
+# Option setting how long entities keep serving the last good reading,
+# flagged stale, after updates start failing
+CONF_STALE_GRACE = "stale_grace"
+DEFAULT_STALE_GRACE = timedelta(hours=2)
+
+# Services
+SERVICE_BACKFILL = "backfill"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+
+# Hourly statistics sent to the recorder per import job
+STATISTICS_IMPORT_BATCH_SIZE = 500
+
+# -------------------------------------------------------------------
+# Montreal open data portal (Ckan datastore)
+# -------------------------------------------------------------------
+
+API_URL = "https://donnees.montreal.ca/api/3/action/datastore_search"
+API_TIMEOUT = 10  # seconds
+
+# List of RSQA monitoring stations
+RESOURCE_ID_STATIONS = "29db5545-89a4-4e4a-9e95-05aa6dc2fd80"
+# Real-time AQI sub-indices per station, pollutant and hour
+RESOURCE_ID_AQI_REALTIME = "f4eca3bf-5ded-4d3c-a8dc-ed42486498f3"
+# Hourly AQI history per station (fallback source)
+RESOURCE_ID_AQI_HISTORY = "6554355e-63d1-4a01-a268-91e0763c3606"
+
+# Connection pool of the integration's aiohttp session
+CONNECTION_LIMIT_PER_HOST = 4
+DNS_CACHE_TTL = 300  # seconds
+KEEPALIVE_TIMEOUT = 60  # seconds
+
+# Records fetched per page when reading a datastore resource
+DATASTORE_PAGE_SIZE = 1000
+
+# Records fetched per page for all stations, large enough for a single request
+API_REQUEST_LIMIT = 32000
+
+# Batched fallback query: records fetched for all stations at once, and how
+# long a batch is shared by the stations needing a fallback in the same cycle
+FALLBACK_BATCH_LIMIT = 1000
+FALLBACK_BATCH_TTL = timedelta(minutes=5)
+FALLBACK_BATCH_MAX_SIZE = 4
+
+# Fallback results are cached per (station, hour). Fallback data is published
+# hourly, so a result stays valid for the hour; missing data and errors are
+# retried sooner.
+FALLBACK_CACHE_TTL = timedelta(hours=1)
+FALLBACK_NEGATIVE_CACHE_TTL = timedelta(minutes=5)
+FALLBACK_CACHE_MAX_SIZE = 256
+
+# Circuit breaker per upstream: consecutive failures before opening, and
+# backoff before probing again, doubled on each failed probe
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_BASE_DELAY = timedelta(minutes=1)
+CIRCUIT_MAX_DELAY = timedelta(hours=1)
+
+# Upstreams guarded by a circuit breaker
+UPSTREAM_REALTIME = "realtime"
+UPSTREAM_HISTORY = "history"
+
+# Records fetched per page when backfilling a station history
+BACKFILL_PAGE_SIZE = 1000
+
+# Format version of recorded open data portal responses
+RECORDING_VERSION = 1
+# Most recent exchanges kept in a recording, older ones are dropped
+RECORDING_MAX_EXCHANGES = 1000
+# Delay before pending recorded exchanges are flushed to disk
+RECORDING_SAVE_DELAY = timedelta(seconds=60)
+
+# Timezone of the RSQA date/hour fields
+RSQA_TIMEZONE = "America/Toronto"
+
 # Update interval: 30 minutes (official API update frequency)
+# Used until the publication-aligned schedule knows a measurement timestamp.
 # For development/testing: timedelta(minutes=5)
 UPDATE_INTERVAL = timedelta(minutes=30)
 
+# Measurements are stamped at the start of their hour and published
+# 50 minutes later, as per Montreal data documentation.
+PUBLICATION_DELAY = timedelta(minutes=50)
+# Margin after the expected publication before polling
+PUBLICATION_MARGIN = timedelta(minutes=2)
+# Backoff between polls when an expected publication is late
+PUBLICATION_RETRY_DELAYS = (
+    timedelta(minutes=2),
+    timedelta(minutes=5),
+    timedelta(minutes=10),
+)
+
+# Number of recent updates used for the fetch latency percentiles
+METRICS_WINDOW = 48
+
+# Number of update cycles kept with their timing breakdown for diagnostics
+CYCLE_HISTORY_SIZE = 20
+
 # Minimum number of pollutants required for a valid AQI measurement.
 # If fewer than this number are available, the data is considered incomplete
 # (e.g., sensor malfunction) and the update will be rejected.
 MIN_REQUIRED_POLLUTANTS = 3
 
+# Pollutants driving the AQI in Montreal. With both measured, an AQI computed
+# from fewer than MIN_REQUIRED_POLLUTANTS is used without the fallback source.
+AQI_KEY_POLLUTANTS = ("PM2.5", "O3")
+
 # -------------------------------------------------------------------
 # Sensor Descriptions
 # -------------------------------------------------------------------
@@ -113,3 +255,22 @@ PPB_TO_UGM3: dict[str, float] = {
     "SO2": 64.07 / 24.45,
     "CO": 28.01 / 24.45,
 }
+
+# -------------------------------------------------------------------
+# AQI Reference Values
+# -------------------------------------------------------------------
+
+POLLUTANT_ALIASES: dict[str, str] = {
+    # Alternative pollutant codes found in RSQA records.
+    "PM": "PM2.5",
+    "PM25": "PM2.5",
+}
+
+REFERENCE_VALUES: dict[str, dict[str, Any]] = {
+    # Concentration matching a sub-index of 100 for each pollutant.
+    "SO2": {"fullname": "sulfur dioxide", "ref": 500.0, "unit": "µg/m3"},
+    "CO": {"fullname": "carbon monoxide", "ref": 35.0, "unit": "mg/m3"},
+    "O3": {"fullname": "ozone", "ref": 160.0, "unit": "µg/m3"},
+    "NO2": {"fullname": "nitrogen dioxide", "ref": 400.0, "unit": "µg/m3"},
+    "PM2.5": {"fullname": "particulate matter PM2.5", "ref": 35.0, "unit": "µg/m3"},
+}
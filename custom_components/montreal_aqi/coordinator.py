@@ -1,33 +1,246 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant
+    from datetime import datetime
+
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
 
     from .api import MontrealAQIApi
+    from .storage import MontrealAQIRollingStore, MontrealAQISnapshotStore
 
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, MIN_REQUIRED_POLLUTANTS, PPB_TO_UGM3, UPDATE_INTERVAL
+from .aqi import compute_aqi
+from .circuit import CircuitOpenError
+from .const import (
+    DEFAULT_STALE_GRACE,
+    DEFAULT_UPDATE_DEADLINE,
+    DOMAIN,
+    MIN_REQUIRED_POLLUTANTS,
+    PPB_TO_UGM3,
+    PUBLICATION_DELAY,
+    UPDATE_INTERVAL,
+)
+from .metrics import CycleHistory, StationMetrics, measure_phase
+from .models import StationReading
+from .rolling import StationRollingStats
+from .scheduler import PublicationScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class MontrealAQICoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    """Coordinator for Montreal AQI data fetching."""
+class MontrealAQINetworkCoordinator(
+    DataUpdateCoordinator[dict[str, dict[str, Any] | None]]
+):
+    """Domain-wide coordinator fetching every configured station in one cycle.
+
+    Station coordinators register their station ID here and are refreshed
+    from the shared snapshot instead of polling the API on their own.
+    Polls are aligned on the hourly RSQA publications.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: MontrealAQIApi) -> None:
+        """Initialize network coordinator.
+
+        Args:
+            hass: Home Assistant instance
+            api: Montreal AQI API wrapper shared by all stations
+        """
+        self.api = api
+        # Update deadline of each registered station
+        self._deadlines: dict[str, timedelta] = {}
+        self._lock = asyncio.Lock()
+        self._scheduler = PublicationScheduler()
+        self.cycles = CycleHistory()
+        self.deadline_overruns = 0
+        # Duration of the latest upstream fetch, None if it was skipped
+        self.fetch_duration: float | None = None
+        # Open circuit the last snapshot is being served through, if any
+        self._circuit_error: CircuitOpenError | None = None
+        self._refresh_task: asyncio.Task[None] | None = None
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_network",
+            update_interval=UPDATE_INTERVAL,
+        )
+
+    @property
+    def station_ids(self) -> set[str]:
+        """Return the station IDs fetched on each cycle."""
+        return set(self._deadlines)
+
+    @property
+    def deadline(self) -> timedelta:
+        """Return the budget of a network update.
+
+        The shared fetch serves every station, so it gets the longest update
+        deadline among them.
+        """
+        return max(self._deadlines.values(), default=DEFAULT_UPDATE_DEADLINE)
+
+    @callback
+    def async_add_station(
+        self, station_id: str, update_deadline: timedelta = DEFAULT_UPDATE_DEADLINE
+    ) -> None:
+        """Include a station in the next update cycles.
+
+        Args:
+            station_id: RSQA station ID
+            update_deadline: Update deadline set in the station options
+        """
+        self._deadlines[station_id] = update_deadline
+
+    @callback
+    def async_remove_station(self, station_id: str) -> None:
+        """Stop fetching a station."""
+        self._deadlines.pop(station_id, None)
+        if self.data is not None:
+            self.data.pop(station_id, None)
+
+    async def async_get_station_data(self, station_id: str) -> dict[str, Any] | None:
+        """Return raw data for a station, fetching the network if it is missing.
+
+        The snapshot is only fetched here when it lacks the station, e.g. on
+        first refresh; manual refreshes go through async_request_refresh.
+        Stations missing data at the same time share a single refresh.
+
+        Raises:
+            CircuitOpenError: If the last snapshot is kept while the upstream
+                circuit is open, so stations flag their reading stale
+            UpdateFailed: If the last network update failed
+        """
+        async with self._lock:
+            if self.data is None or station_id not in self.data:
+                if self._refresh_task is None or self._refresh_task.done():
+                    self._refresh_task = self.hass.async_create_task(
+                        self.async_refresh(), f"{DOMAIN} network refresh"
+                    )
+                # The refresh is shared by every station: one station hitting
+                # its own update deadline must not cancel it for the others
+                await asyncio.shield(self._refresh_task)
+
+        if not self.last_update_success:
+            raise UpdateFailed(
+                f"Cannot fetch data for station {station_id}"
+            ) from self.last_exception
+        if (err := self._circuit_error) is not None:
+            raise CircuitOpenError(err.name, err.retry_after)
+
+        station = (self.data or {}).get(station_id)
+        # Copy so each station coordinator can amend its own view
+        return dict(station) if station is not None else None
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify station coordinators, timing the fan-out."""
+        start = time.monotonic()
+        super().async_update_listeners()
+        self.cycles.record_entity_write(time.monotonic() - start)
+
+    async def _async_update_data(self) -> dict[str, dict[str, Any] | None]:
+        """Fetch data for all registered stations, timing the cycle.
+
+        Raises:
+            UpdateFailed: If the fetch fails or overruns the update deadline
+        """
+        try:
+            with self.cycles.measure():
+                async with asyncio.timeout(self.deadline.total_seconds()):
+                    return await self._async_fetch_stations()
+        except TimeoutError as err:
+            self.deadline_overruns += 1
+            self.update_interval = self._scheduler.next_interval(None)
+            _LOGGER.warning(
+                "Coordinator: network update abandoned after %s", self.deadline
+            )
+            raise UpdateFailed(
+                f"Montreal AQI network update overran its {self.deadline} deadline"
+            ) from err
+
+    async def _async_fetch_stations(self) -> dict[str, dict[str, Any] | None]:
+        """Fetch data for all registered stations."""
+        station_ids = sorted(self._deadlines)
+        _LOGGER.debug("Coordinator: updating network data for %s", station_ids)
+
+        self.fetch_duration = None
+        self._circuit_error = None
+        start = time.monotonic()
+        try:
+            stations = await self.api.async_get_stations(station_ids)
+            self.fetch_duration = time.monotonic() - start
+        except CircuitOpenError as err:
+            self.update_interval = max(
+                self._scheduler.next_interval(None),
+                timedelta(seconds=err.retry_after),
+            )
+            if self.data is None:
+                raise UpdateFailed("Cannot fetch Montreal AQI network data") from err
+            self._circuit_error = err
+            # Keep serving the last snapshot until the upstream recovers
+            _LOGGER.warning("Coordinator: %s, keeping last network data", err)
+            return self.data
+        except Exception as err:
+            self.fetch_duration = time.monotonic() - start
+            self.update_interval = self._scheduler.next_interval(None)
+            _LOGGER.error(
+                "Error fetching Montreal AQI network data: %s",
+                err,
+                exc_info=True,
+            )
+            raise UpdateFailed("Cannot fetch Montreal AQI network data") from err
+
+        self.update_interval = self._scheduler.next_interval(
+            _latest_measurement(stations)
+        )
+        _LOGGER.debug("Coordinator: next network update in %s", self.update_interval)
+        return stations
+
+
+def _latest_measurement(
+    stations: dict[str, dict[str, Any] | None],
+) -> datetime | None:
+    """Return the most recent measurement timestamp across stations."""
+    timestamps = [
+        dt_util.as_utc(parsed)
+        for station in stations.values()
+        if station is not None
+        and (parsed := dt_util.parse_datetime(str(station.get("timestamp"))))
+        is not None
+    ]
+    return max(timestamps, default=None)
+
+
+class MontrealAQICoordinator(DataUpdateCoordinator[StationReading]):
+    """Coordinator for Montreal AQI data fetching.
+
+    When updates start failing, the last good reading keeps being served,
+    flagged stale, for the stale grace window (stale-while-revalidate).
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
         api: MontrealAQIApi,
         station_id: str,
+        network: MontrealAQINetworkCoordinator | None = None,
+        snapshot_store: MontrealAQISnapshotStore | None = None,
+        rolling_store: MontrealAQIRollingStore | None = None,
+        update_deadline: timedelta = DEFAULT_UPDATE_DEADLINE,
+        stale_grace: timedelta = DEFAULT_STALE_GRACE,
     ) -> None:
         """Initialize coordinator.
 
@@ -35,36 +248,188 @@ class MontrealAQICoordinator(DataUpdateCoordinator[dict[str, Any]]):
             hass: Home Assistant instance
             api: Montreal AQI API wrapper
             station_id: Station ID as string
+            network: Shared network coordinator; when set, this coordinator
+                does not poll and is refreshed from the network snapshot
+            snapshot_store: Store persisting the last good data, if any
+            rolling_store: Store persisting the rolling statistics, if any
+            update_deadline: Time budget of an update cycle, including the
+                fallback source
+            stale_grace: How long the last good reading is served, flagged
+                stale, once updates start failing
         """
         self.api = api
         self.station_id = station_id
+        self.network = network
+        self.snapshot_store = snapshot_store
+        self.rolling_store = rolling_store
+        self.rolling = StationRollingStats()
+        self.metrics = StationMetrics()
+        self.cycles = CycleHistory()
+        self.deadline = update_deadline
+        self.stale_grace = stale_grace
+        self.stale_since: datetime | None = None
+        self._unsub_stale: CALLBACK_TYPE | None = None
 
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN}_{station_id}",
-            update_interval=UPDATE_INTERVAL,
+            update_interval=None if network is not None else UPDATE_INTERVAL,
+            # Readings compare by value, so listeners are only notified when
+            # the measurement timestamp or a value actually changed
+            always_update=False,
         )
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch and process data from API."""
-        _LOGGER.debug(
-            "Coordinator: updating data for station %s",
+    @property
+    def stale(self) -> bool:
+        """Return True if the reading served is from before failed updates."""
+        return self.stale_since is not None
+
+    @property
+    def available(self) -> bool:
+        """Return if the reading can be served to entities.
+
+        A stale reading is served until the grace window expires.
+        """
+        if self.stale_since is not None:
+            return dt_util.utcnow() - self.stale_since < self.stale_grace
+        return self.last_update_success
+
+    @callback
+    def _async_mark_stale(self) -> None:
+        """Start the grace window on the first failed update, if any data."""
+        if self.stale_since is not None or self.data is None:
+            return
+        self.stale_since = dt_util.utcnow()
+        self._unsub_stale = async_call_later(
+            self.hass, self.stale_grace, self._async_stale_grace_expired
+        )
+
+    @callback
+    def _async_mark_fresh(self) -> None:
+        """End the grace window after a successful update."""
+        self.stale_since = None
+        if self._unsub_stale is not None:
+            self._unsub_stale()
+            self._unsub_stale = None
+
+    @callback
+    def _async_stale_grace_expired(self, _now: datetime) -> None:
+        """Make entities unavailable once the grace window expired."""
+        self._unsub_stale = None
+        _LOGGER.warning(
+            "Coordinator: no update for station %s in %s, data unavailable",
             self.station_id,
+            self.stale_grace,
         )
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the grace window timer and shut down."""
+        self._async_mark_fresh()
+        await super().async_shutdown()
 
+    @callback
+    def async_handle_network_update(self) -> None:
+        """Reprocess this station when the network snapshot changes."""
+        self.hass.async_create_task(self.async_refresh())
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh, fetching the network again when shared.
+
+        A manual refresh (e.g. homeassistant.update_entity) would otherwise
+        only reprocess the cached snapshot. It goes through the debounced
+        network refresh instead, which reprocesses every station once the new
+        snapshot is in.
+        """
+        if self.network is not None:
+            await self.network.async_request_refresh()
+            return
+        await super().async_request_refresh()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered entities, timing the fan-out."""
+        start = time.monotonic()
+        super().async_update_listeners()
+        self.cycles.record_entity_write(time.monotonic() - start)
+
+    async def _async_update_data(self) -> StationReading:
+        """Fetch and process data from API, recording metrics and timings."""
         try:
-            data = await self.api.async_get_station(self.station_id)
-        except Exception as err:
-            _LOGGER.error(
-                "Error fetching Montreal AQI data for station %s: %s",
+            with self.cycles.measure():
+                # Budget for the primary fetch and the fallback together
+                async with asyncio.timeout(self.deadline.total_seconds()):
+                    reading = await self._async_fetch_reading()
+        except TimeoutError as err:
+            self.metrics.record_overrun()
+            self.metrics.async_record_result(success=False)
+            self._async_mark_stale()
+            _LOGGER.warning(
+                "Coordinator: update of station %s abandoned after %s",
                 self.station_id,
-                err,
-                exc_info=True,
+                self.deadline,
             )
             raise UpdateFailed(
-                f"Cannot fetch data for station {self.station_id}"
+                f"Update of station {self.station_id} overran its "
+                f"{self.deadline} deadline"
             ) from err
+        except CircuitOpenError as err:
+            self.metrics.async_record_result(success=False)
+            if self.data is None:
+                raise UpdateFailed(
+                    f"Cannot fetch data for station {self.station_id}"
+                ) from err
+            self._async_mark_stale()
+            # Keep serving the last reading until the upstream recovers. It is
+            # flagged stale, so it differs from the fresh one and listeners
+            # are notified once, when the circuit opens
+            _LOGGER.warning(
+                "Coordinator: %s, keeping last data for station %s",
+                err,
+                self.station_id,
+            )
+            return self.data.as_stale()
+        except UpdateFailed:
+            self.metrics.async_record_result(success=False)
+            self._async_mark_stale()
+            raise
+        self._async_mark_fresh()
+        self.metrics.async_record_result(success=True)
+        return reading
+
+    async def _async_fetch_reading(self) -> StationReading:
+        """Fetch and process data from API."""
+        _LOGGER.debug(
+            "Coordinator: updating data for station %s",
+            self.station_id,
+        )
+
+        if self.network is not None:
+            try:
+                data = await self.network.async_get_station_data(self.station_id)
+            finally:
+                # Record the upstream fetch behind the snapshot, not the lookup
+                if self.network.fetch_duration is not None:
+                    self.metrics.record_fetch(self.network.fetch_duration)
+        else:
+            start = time.monotonic()
+            try:
+                data = await self.api.async_get_station(self.station_id)
+            except (CircuitOpenError, UpdateFailed):
+                raise
+            except Exception as err:
+                _LOGGER.error(
+                    "Error fetching Montreal AQI data for station %s: %s",
+                    self.station_id,
+                    err,
+                    exc_info=True,
+                )
+                raise UpdateFailed(
+                    f"Cannot fetch data for station {self.station_id}"
+                ) from err
+            finally:
+                self.metrics.record_fetch(time.monotonic() - start)
 
         if not data:
             _LOGGER.warning(
@@ -94,8 +459,21 @@ class MontrealAQICoordinator(DataUpdateCoordinator[dict[str, Any]]):
             if value and value.get("concentration") is not None
         }
         num_available = len(available_pollutants)
+        with measure_phase("parse"):
+            local = compute_aqi(pollutants)
 
-        if num_available < MIN_REQUIRED_POLLUTANTS:
+        if num_available < MIN_REQUIRED_POLLUTANTS and local.reliable:
+            # The pollutants driving the index are measured: no need to ask
+            # the fallback source
+            _LOGGER.info(
+                "Coordinator: computed AQI locally for station %s from %s (AQI: %s)",
+                self.station_id,
+                list(local.sub_indices),
+                local.aqi,
+            )
+            data["aqi"] = local.aqi
+            data["dominant_pollutant"] = local.dominant_pollutant
+        elif num_available < MIN_REQUIRED_POLLUTANTS:
             _LOGGER.warning(
                 "Coordinator: insufficient pollutant data for station %s. "
                 "Only %d out of %d required pollutants are available. "
@@ -118,9 +496,11 @@ class MontrealAQICoordinator(DataUpdateCoordinator[dict[str, Any]]):
                     pass
 
             # Try fallback source (Ckan datastore)
-            fallback_data = await self.api.async_get_aqi_fallback(
-                self.station_id, hour_str
-            )
+            self.metrics.record_fallback()
+            with measure_phase("fallback"):
+                fallback_data = await self.api.async_get_aqi_fallback(
+                    self.station_id, hour_str
+                )
             if fallback_data:
                 _LOGGER.info(
                     "Coordinator: using fallback AQI for station %s (AQI: %s)",
@@ -150,7 +530,7 @@ class MontrealAQICoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 parsed = dt_util.parse_datetime(timestamp_str)
                 if parsed is not None:
                     # Add 50 minutes as per Montreal data documentation
-                    timestamp = parsed + timedelta(minutes=50)
+                    timestamp = parsed + PUBLICATION_DELAY
                 else:
                     _LOGGER.warning(
                         "Coordinator: failed to parse timestamp '%s' for station %s",
@@ -165,50 +545,76 @@ class MontrealAQICoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 )
 
         # Process pollutants with unit conversion
-        pollutants = data.get("pollutants", {})
-        processed_pollutants = self._convert_pollutants(pollutants)
+        with measure_phase("parse"):
+            pollutants = data.get("pollutants", {})
+            processed_pollutants = convert_pollutants(pollutants)
 
-        return {
-            "aqi": data.get("aqi"),
-            "dominant_pollutant": data.get("dominant_pollutant"),
-            "pollutants": processed_pollutants,
-            "timestamp": timestamp,
-        }
+            reading = StationReading(
+                aqi=self._convert_aqi(data.get("aqi")),
+                dominant_pollutant=data.get("dominant_pollutant"),
+                pollutants=processed_pollutants,
+                timestamp=timestamp,
+                sub_indices=local.sub_indices,
+            )
+        if reading == self.data:
+            _LOGGER.debug(
+                "Coordinator: measurement unchanged for station %s", self.station_id
+            )
+            return reading
+
+        if self.snapshot_store is not None:
+            self.snapshot_store.async_schedule_save(reading)
+        if self.rolling.add_reading(reading) and self.rolling_store is not None:
+            self.rolling_store.async_schedule_save(self.rolling)
+        return reading
 
-    def _convert_pollutants(
-        self, pollutants: dict[str, Any]
-    ) -> dict[str, dict[str, float | None]]:
-        """Convert pollutant units from PPB to µg/m³ if needed, keeping concentration key."""
-        converted: dict[str, dict[str, float | None]] = {}
-        for pollutant_name, value in pollutants.items():
-            raw_value = (
-                value.get("concentration")
-                if isinstance(value, dict) and "concentration" in value
-                else value
+    def _convert_aqi(self, value: float | str | None) -> int | None:
+        """Convert the AQI value to an integer."""
+        if value is None:
+            return None
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            _LOGGER.warning(
+                "Coordinator: invalid AQI value for station %s: %s",
+                self.station_id,
+                value,
             )
+            return None
 
-            if raw_value is None:
-                converted[pollutant_name] = {"concentration": None}
-                continue
 
-            try:
-                float_value = float(raw_value)
-            except (ValueError, TypeError):
-                _LOGGER.warning(
-                    "Coordinator: invalid pollutant value for %s: %s",
-                    pollutant_name,
-                    value,
-                )
-                converted[pollutant_name] = {"concentration": None}
-                continue
+def convert_pollutants(pollutants: dict[str, Any]) -> dict[str, float | None]:
+    """Convert pollutant concentrations from PPB to µg/m³ if needed."""
+    converted: dict[str, float | None] = {}
+    for pollutant_name, value in pollutants.items():
+        raw_value = (
+            value.get("concentration")
+            if isinstance(value, dict) and "concentration" in value
+            else value
+        )
 
-            if pollutant_name in PPB_TO_UGM3:
-                converted_value: float | int = round(
-                    float_value * PPB_TO_UGM3[pollutant_name]
-                )
-            else:
-                converted_value = int(float_value)
+        if raw_value is None:
+            converted[pollutant_name] = None
+            continue
+
+        try:
+            float_value = float(raw_value)
+        except (ValueError, TypeError):
+            _LOGGER.warning(
+                "Coordinator: invalid pollutant value for %s: %s",
+                pollutant_name,
+                value,
+            )
+            converted[pollutant_name] = None
+            continue
+
+        if pollutant_name in PPB_TO_UGM3:
+            converted_value: float | int = round(
+                float_value * PPB_TO_UGM3[pollutant_name]
+            )
+        else:
+            converted_value = int(float_value)
 
-            converted[pollutant_name] = {"concentration": converted_value}
+        converted[pollutant_name] = converted_value
 
-        return converted
+    return converted
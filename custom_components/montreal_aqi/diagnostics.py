@@ -0,0 +1,74 @@
+"""Diagnostics support for Montreal AQI."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import MontrealAQICoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Includes the current reading, fetch metrics, executor queue waits and the
+    timing breakdown of the recent update cycles of the station and of the
+    shared network.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry
+
+    Returns:
+        Diagnostics data
+    """
+    coordinator: MontrealAQICoordinator = hass.data[DOMAIN][entry.entry_id]
+    metrics = coordinator.metrics
+    executor_limit = coordinator.api.executor_limit
+
+    diagnostics: dict[str, Any] = {
+        "entry": {"title": entry.title, "data": dict(entry.data)},
+        "station": {
+            "last_update_success": coordinator.last_update_success,
+            "last_exception": repr(coordinator.last_exception)
+            if coordinator.last_exception
+            else None,
+            "reading": coordinator.data.as_dict() if coordinator.data else None,
+            "metrics": {
+                "updates": metrics.updates,
+                "consecutive_failures": metrics.consecutive_failures,
+                "fallback_updates": metrics.fallback_updates,
+                "deadline_overruns": metrics.deadline_overruns,
+                "last_fetch_duration": metrics.last_fetch_duration,
+                "latency_p50": metrics.latency_p50,
+                "latency_p95": metrics.latency_p95,
+                "bytes_received": coordinator.api.transport.bytes_received,
+            },
+            "cycles": coordinator.cycles.as_list(),
+        },
+        "executor": {
+            "use_library": coordinator.api.use_library,
+            "max_parallel_fetches": executor_limit.max_parallel_fetches,
+            "jobs": executor_limit.queue_wait.jobs,
+            "queue_wait_p50": executor_limit.queue_wait.p50,
+            "queue_wait_p95": executor_limit.queue_wait.p95,
+        },
+    }
+
+    if (network := coordinator.network) is not None:
+        diagnostics["network"] = {
+            "station_ids": sorted(network.station_ids),
+            "update_interval": str(network.update_interval),
+            "last_update_success": network.last_update_success,
+            "deadline_overruns": network.deadline_overruns,
+            "cycles": network.cycles.as_list(),
+        }
+
+    return diagnostics
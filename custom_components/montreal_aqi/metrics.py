@@ -0,0 +1,205 @@
+"""Fetch metrics and update cycle timings for Montreal AQI diagnostics."""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from .const import CYCLE_HISTORY_SIZE, METRICS_WINDOW
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from datetime import datetime
+
+    from homeassistant.core import CALLBACK_TYPE
+
+
+def _percentile(samples: deque[float], quantile: float) -> float | None:
+    """Return the nearest-rank percentile of samples, or None if empty."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(quantile * len(ordered)) - 1)]
+
+
+class StationMetrics:
+    """Fetch timing, fallback and failure metrics of a station.
+
+    Latencies are kept for the last METRICS_WINDOW updates. Listeners are
+    called after every update, including those not changing the reading.
+    """
+
+    def __init__(self) -> None:
+        """Initialize metrics."""
+        self.last_fetch_duration: float | None = None
+        self.consecutive_failures = 0
+        self.updates = 0
+        self.fallback_updates = 0
+        self.deadline_overruns = 0
+        self._latencies: deque[float] = deque(maxlen=METRICS_WINDOW)
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def latency_p50(self) -> float | None:
+        """Return the median fetch duration in seconds."""
+        return _percentile(self._latencies, 0.5)
+
+    @property
+    def latency_p95(self) -> float | None:
+        """Return the 95th percentile fetch duration in seconds."""
+        return _percentile(self._latencies, 0.95)
+
+    @property
+    def fallback_ratio(self) -> float | None:
+        """Return the share of updates that needed the fallback source."""
+        if not self.updates:
+            return None
+        return self.fallback_updates / self.updates
+
+    def record_fetch(self, duration: float) -> None:
+        """Record the duration of a fetch, in seconds."""
+        self.last_fetch_duration = duration
+        self._latencies.append(duration)
+
+    def record_fallback(self) -> None:
+        """Record an update falling back to the Ckan source."""
+        self.fallback_updates += 1
+
+    def record_overrun(self) -> None:
+        """Record an update abandoned at the update deadline."""
+        self.deadline_overruns += 1
+
+    @callback
+    def async_record_result(self, success: bool) -> None:
+        """Record the outcome of an update and notify listeners."""
+        self.updates += 1
+        self.consecutive_failures = 0 if success else self.consecutive_failures + 1
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Listen for recorded updates; returns a function to stop listening."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def _remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return _remove_listener
+
+
+class QueueWaitMetrics:
+    """Time blocking library calls waited before running, in seconds.
+
+    Covers the wait for a parallel fetch slot and for an executor thread,
+    over the last METRICS_WINDOW calls. A high p95 means the parallel fetch
+    limit is too low for the configured stations.
+    """
+
+    def __init__(self) -> None:
+        """Initialize metrics."""
+        self.jobs = 0
+        self._waits: deque[float] = deque(maxlen=METRICS_WINDOW)
+
+    @property
+    def p50(self) -> float | None:
+        """Return the median queue wait in seconds."""
+        return _percentile(self._waits, 0.5)
+
+    @property
+    def p95(self) -> float | None:
+        """Return the 95th percentile queue wait in seconds."""
+        return _percentile(self._waits, 0.95)
+
+    def record(self, wait: float) -> None:
+        """Record the queue wait of a job, in seconds."""
+        self.jobs += 1
+        self._waits.append(wait)
+
+
+@dataclass(slots=True)
+class CycleTiming:
+    """Time spent in each phase of an update cycle, in seconds.
+
+    The fallback phase includes the HTTP time of the fallback requests.
+    """
+
+    started: datetime
+    total: float = 0.0
+    executor_wait: float = 0.0
+    http: float = 0.0
+    parse: float = 0.0
+    fallback: float = 0.0
+    entity_write: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timing with durations in milliseconds."""
+        timing: dict[str, Any] = {"started": self.started.isoformat()}
+        for field in fields(self)[1:]:
+            timing[f"{field.name}_ms"] = round(getattr(self, field.name) * 1000, 3)
+        return timing
+
+
+# Cycle being measured in the current task, filled by the API and coordinators
+_CURRENT_CYCLE: ContextVar[CycleTiming | None] = ContextVar(
+    "montreal_aqi_cycle", default=None
+)
+
+
+def record_phase(phase: str, duration: float) -> None:
+    """Add time spent in a phase to the cycle being measured, if any."""
+    if (cycle := _CURRENT_CYCLE.get()) is not None:
+        setattr(cycle, phase, getattr(cycle, phase) + duration)
+
+
+@contextmanager
+def measure_phase(phase: str) -> Iterator[None]:
+    """Measure the time spent in a phase of the current cycle."""
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        record_phase(phase, time.monotonic() - start)
+
+
+class CycleHistory:
+    """Ring buffer of the timing breakdown of the last update cycles."""
+
+    def __init__(self, size: int = CYCLE_HISTORY_SIZE) -> None:
+        """Initialize history.
+
+        Args:
+            size: Number of cycles kept
+        """
+        self.cycles: deque[CycleTiming] = deque(maxlen=size)
+
+    @contextmanager
+    def measure(self) -> Iterator[CycleTiming]:
+        """Measure an update cycle and add it to the history."""
+        cycle = CycleTiming(started=dt_util.utcnow())
+        token = _CURRENT_CYCLE.set(cycle)
+        start = time.monotonic()
+        try:
+            yield cycle
+        finally:
+            cycle.total = time.monotonic() - start
+            _CURRENT_CYCLE.reset(token)
+            self.cycles.append(cycle)
+
+    def record_entity_write(self, duration: float) -> None:
+        """Add listener fan-out time to the latest cycle."""
+        if self.cycles:
+            self.cycles[-1].entity_write += duration
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the cycles, oldest first."""
+        return [cycle.as_dict() for cycle in self.cycles]
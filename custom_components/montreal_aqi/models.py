@@ -0,0 +1,74 @@
+"""Data models for Montreal AQI."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from datetime import datetime
+
+
+@dataclass(frozen=True, slots=True)
+class StationReading:
+    """Processed reading of a monitoring station.
+
+    Built once per update by the coordinator with values already validated
+    and converted, so entities only read plain attributes.
+    """
+
+    aqi: int | None
+    dominant_pollutant: str | None
+    # Pollutant concentrations in µg/m³, None when not measured
+    pollutants: Mapping[str, float | None] = field(default_factory=dict)
+    timestamp: datetime | None = None
+    # True when restored from storage rather than fetched live
+    restored: bool = False
+    # AQI sub-index of each measured pollutant
+    sub_indices: Mapping[str, int] = field(default_factory=dict)
+    # True when served again because the upstream could not be queried; only
+    # fresh readings are persisted, so the flag is not serialized
+    stale: bool = False
+
+    def __post_init__(self) -> None:
+        """Freeze the mappings so a shared reading cannot be mutated."""
+        object.__setattr__(self, "pollutants", MappingProxyType(dict(self.pollutants)))
+        object.__setattr__(
+            self, "sub_indices", MappingProxyType(dict(self.sub_indices))
+        )
+
+    def as_restored(self) -> StationReading:
+        """Return a copy flagged as restored from storage."""
+        return replace(self, restored=True)
+
+    def as_stale(self) -> StationReading:
+        """Return a copy flagged as served again after a skipped update."""
+        return replace(self, stale=True)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable representation."""
+        return {
+            "aqi": self.aqi,
+            "dominant_pollutant": self.dominant_pollutant,
+            "pollutants": dict(self.pollutants),
+            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
+            "restored": self.restored,
+            "sub_indices": dict(self.sub_indices),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> StationReading:
+        """Build a reading from its as_dict() representation."""
+        timestamp = data.get("timestamp")
+        return cls(
+            aqi=data.get("aqi"),
+            dominant_pollutant=data.get("dominant_pollutant"),
+            pollutants=dict(data.get("pollutants") or {}),
+            timestamp=dt_util.parse_datetime(timestamp) if timestamp else None,
+            restored=bool(data.get("restored", False)),
+            sub_indices=dict(data.get("sub_indices") or {}),
+        )
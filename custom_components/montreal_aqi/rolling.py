@@ -0,0 +1,192 @@
+"""Rolling hourly averages and maxima of pollutant concentrations."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from .const import ROLLING_HOURS, ROLLING_WINDOWS
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .models import StationReading
+
+_HOUR_SECONDS = 3600
+
+
+class _WindowStats:
+    """Running sum, count and maximum over the last hours of a window."""
+
+    __slots__ = ("count", "hours", "maxima", "total")
+
+    def __init__(self, hours: int) -> None:
+        self.hours = hours
+        self.total = 0.0
+        self.count = 0
+        # (hour, value) pairs with decreasing values: the first one is the max
+        self.maxima: deque[tuple[int, float]] = deque()
+
+
+class HourlyRingBuffer:
+    """Last ROLLING_HOURS hourly values of a pollutant, with rolling stats.
+
+    Values live in a fixed-size array indexed by hour, NaN marking hours
+    without a measurement. Each window keeps a running sum and count and a
+    monotonic queue of candidate maxima, so adding an hour is O(1) per window
+    (amortized for the maximum).
+    """
+
+    def __init__(self, size: int = ROLLING_HOURS) -> None:
+        """Initialize buffer.
+
+        Args:
+            size: Number of hours kept, at least the longest window
+        """
+        self.size = size
+        self.hour: int | None = None
+        self._values = array("d", [math.nan] * size)
+        self._windows = {hours: _WindowStats(hours) for hours in ROLLING_WINDOWS}
+
+    def add(self, hour: int, value: float | None) -> bool:
+        """Add the value of an hour, counted in hours since the epoch.
+
+        Hours skipped since the latest value are recorded as missing. Values
+        for the latest hour or older ones are ignored.
+
+        Returns:
+            True if the value was added
+        """
+        last = self.hour
+        if last is not None and hour <= last:
+            return False
+        if last is None or hour - last >= self.size:
+            self._reset()
+            last = hour - 1
+
+        for missing in range(last + 1, hour):
+            self._append(missing, None)
+        self._append(hour, value)
+        return True
+
+    def mean(self, hours: int) -> float | None:
+        """Return the mean of the measured values of the last hours."""
+        stats = self._windows[hours]
+        return stats.total / stats.count if stats.count else None
+
+    def max(self, hours: int) -> float | None:
+        """Return the maximum of the measured values of the last hours."""
+        maxima = self._windows[hours].maxima
+        return maxima[0][1] if maxima else None
+
+    def _reset(self) -> None:
+        for index in range(self.size):
+            self._values[index] = math.nan
+        self._windows = {hours: _WindowStats(hours) for hours in ROLLING_WINDOWS}
+
+    def _append(self, hour: int, value: float | None) -> None:
+        new = math.nan if value is None else float(value)
+        for stats in self._windows.values():
+            # Value leaving the window, read before its slot may be reused
+            old = self._values[(hour - stats.hours) % self.size]
+            if not math.isnan(old):
+                stats.total -= old
+                stats.count -= 1
+            if not math.isnan(new):
+                stats.total += new
+                stats.count += 1
+                while stats.maxima and stats.maxima[-1][1] <= new:
+                    stats.maxima.pop()
+                stats.maxima.append((hour, new))
+            while stats.maxima and stats.maxima[0][0] <= hour - stats.hours:
+                stats.maxima.popleft()
+            if not stats.count:
+                # Drop accumulated rounding errors once the window is empty
+                stats.total = 0.0
+        self._values[hour % self.size] = new
+        self.hour = hour
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable representation, oldest value first."""
+        if self.hour is None:
+            return {"hour": None, "values": []}
+        first = self.hour - self.size + 1
+        return {
+            "hour": self.hour,
+            "values": [
+                None if math.isnan(value) else value
+                for value in (
+                    self._values[hour % self.size]
+                    for hour in range(first, self.hour + 1)
+                )
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> HourlyRingBuffer:
+        """Build a buffer from its as_dict() representation."""
+        buffer = cls()
+        if (hour := data.get("hour")) is None:
+            return buffer
+        values = list(data.get("values") or [])[-buffer.size :]
+        first = hour - len(values) + 1
+        for offset, value in enumerate(values):
+            buffer.add(first + offset, value)
+        return buffer
+
+
+class StationRollingStats:
+    """Rolling statistics of each pollutant of a station."""
+
+    def __init__(self) -> None:
+        """Initialize statistics."""
+        self.buffers: dict[str, HourlyRingBuffer] = {}
+
+    def add_reading(self, reading: StationReading) -> bool:
+        """Add the concentrations of a reading for its measurement hour.
+
+        Pollutants missing from the reading are recorded as not measured.
+
+        Returns:
+            True if the reading was for a new hour
+        """
+        if reading.timestamp is None:
+            return False
+        hour = _epoch_hour(reading.timestamp)
+        for code in reading.pollutants.keys() - self.buffers.keys():
+            self.buffers[code] = HourlyRingBuffer()
+
+        added = False
+        for code, buffer in self.buffers.items():
+            added |= buffer.add(hour, reading.pollutants.get(code))
+        return added
+
+    def mean(self, code: str, hours: int) -> float | None:
+        """Return the rolling mean of a pollutant over the last hours."""
+        buffer = self.buffers.get(code)
+        return buffer.mean(hours) if buffer is not None else None
+
+    def max(self, code: str, hours: int) -> float | None:
+        """Return the rolling maximum of a pollutant over the last hours."""
+        buffer = self.buffers.get(code)
+        return buffer.max(hours) if buffer is not None else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable representation."""
+        return {code: buffer.as_dict() for code, buffer in self.buffers.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> StationRollingStats:
+        """Build statistics from their as_dict() representation."""
+        stats = cls()
+        stats.buffers = {
+            code: HourlyRingBuffer.from_dict(buffer) for code, buffer in data.items()
+        }
+        return stats
+
+
+def _epoch_hour(timestamp: datetime) -> int:
+    """Return the number of hours since the epoch of a timestamp."""
+    return int(timestamp.timestamp() // _HOUR_SECONDS)
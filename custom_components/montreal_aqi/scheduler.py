@@ -0,0 +1,89 @@
+"""Publication-aligned polling schedule for Montreal AQI."""
+
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    PUBLICATION_DELAY,
+    PUBLICATION_MARGIN,
+    PUBLICATION_RETRY_DELAYS,
+    UPDATE_INTERVAL,
+)
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+_LOGGER = logging.getLogger(__name__)
+
+_HOUR = timedelta(hours=1)
+
+
+class PublicationScheduler:
+    """Compute when to poll next from the last measurement timestamp.
+
+    RSQA measurements are stamped hourly and published PUBLICATION_DELAY
+    after their hour. The next poll is placed right after the next expected
+    publication. If the data has not moved by then, the poll is retried with
+    PUBLICATION_RETRY_DELAYS before waiting for the following hour.
+    """
+
+    def __init__(self) -> None:
+        """Initialize scheduler."""
+        self._last_measurement: datetime | None = None
+        self._retries = 0
+
+    @property
+    def last_measurement(self) -> datetime | None:
+        """Return the latest measurement timestamp seen."""
+        return self._last_measurement
+
+    def next_interval(
+        self, measurement: datetime | None, now: datetime | None = None
+    ) -> timedelta:
+        """Return the delay until the next poll.
+
+        Args:
+            measurement: Latest measurement timestamp (hour stamp) of this
+                poll, or None if the poll returned no data
+            now: Current time, defaults to utcnow
+
+        Returns:
+            Delay before the next poll
+        """
+        now = now or dt_util.utcnow()
+
+        if measurement is not None and (
+            self._last_measurement is None or measurement > self._last_measurement
+        ):
+            self._last_measurement = measurement
+            self._retries = 0
+
+        if self._last_measurement is None:
+            return UPDATE_INTERVAL
+
+        expected = (
+            self._last_measurement + _HOUR + PUBLICATION_DELAY + PUBLICATION_MARGIN
+        )
+        if now < expected:
+            return expected - now
+
+        if self._retries < len(PUBLICATION_RETRY_DELAYS):
+            delay = PUBLICATION_RETRY_DELAYS[self._retries]
+            self._retries += 1
+            _LOGGER.debug(
+                "Scheduler: data for %s not published yet, retry %d in %s",
+                expected - PUBLICATION_DELAY - PUBLICATION_MARGIN,
+                self._retries,
+                delay,
+            )
+            return delay
+
+        # Give up on this hour and wait for the next expected publication
+        self._retries = 0
+        missed_hours = (now - expected) // _HOUR + 1
+        return expected + missed_hours * _HOUR - now
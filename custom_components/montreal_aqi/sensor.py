@@ -1,25 +1,37 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util import dt as dt_util
 
 from .const import (
     CONF_STATION_ID,
     DEVICE_CLASS_MAP,
     DOMAIN,
+    ROLLING_DEFAULT_SENSORS,
+    ROLLING_WINDOWS,
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -64,9 +76,15 @@ async def async_setup_entry(
             coordinator, device_info, entry.entry_id, station_id
         ),
     ]
+    sensors.extend(
+        MontrealAQIMetricSensor(
+            coordinator, device_info, entry.entry_id, station_id, description
+        )
+        for description in METRIC_SENSORS
+    )
 
     # Add pollutant sensors for available pollutants
-    pollutants: dict[str, Any] = coordinator.data.get("pollutants", {})
+    pollutants = coordinator.data.pollutants
     _LOGGER.debug(
         "Setting up sensors for station %s with pollutants: %s",
         station_id,
@@ -89,6 +107,20 @@ async def async_setup_entry(
                 meta=meta,
             )
         )
+        sensors.extend(
+            MontrealAQIRollingSensor(
+                coordinator=coordinator,
+                device_info=device_info,
+                entry_id=entry.entry_id,
+                station_id=station_id,
+                code=code,
+                meta=meta,
+                hours=hours,
+                stat=stat,
+            )
+            for hours in ROLLING_WINDOWS
+            for stat in ("mean", "max")
+        )
 
     _LOGGER.debug("Setting up %d sensors for station %s", len(sensors), station_id)
     async_add_entities(sensors, update_before_add=True)
@@ -126,8 +158,8 @@ class MontrealAQIBaseSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.last_update_success
+        """Return if entity is available, serving stale data for a while."""
+        return self.coordinator.available
 
 
 # -------------------------------------------------------------------
@@ -158,22 +190,15 @@ class MontrealAQIIndexSensor(MontrealAQIBaseSensor):
     @property
     def native_value(self) -> int | None:
         """Return AQI value."""
-        value = self.coordinator.data.get("aqi")
-        if value is None:
-            return None
-        try:
-            return int(value)
-        except (ValueError, TypeError):
-            _LOGGER.warning(
-                "Invalid AQI value for station %s: %s", self._station_id, value
-            )
-            return None
+        return self.coordinator.data.aqi
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra state attributes including measurement timestamp."""
         return {
-            "measurement_timestamp": self.coordinator.data.get("timestamp"),
+            "measurement_timestamp": self.coordinator.data.timestamp,
+            "restored": self.coordinator.data.restored,
+            "stale": self.coordinator.stale,
         }
 
 
@@ -206,32 +231,24 @@ class MontrealAQILevelSensor(MontrealAQIBaseSensor):
     @property
     def native_value(self) -> str | None:
         """Return AQI level based on AQI value."""
-        aqi = self.coordinator.data.get("aqi")
+        aqi = self.coordinator.data.aqi
         if aqi is None:
             return None
 
-        try:
-            aqi_value = float(aqi)
-        except (ValueError, TypeError):
-            _LOGGER.warning(
-                "Invalid AQI value for level calculation (station %s): %s",
-                self._station_id,
-                aqi,
-            )
-            return None
-
-        if aqi_value <= 25:
+        if aqi <= 25:
             return "good"
-        if aqi_value <= 50:
+        if aqi <= 50:
             return "acceptable"
         return "bad"
 
     @property
-    def extra_state_attributes(self) -> dict[str, str | None]:
+    def extra_state_attributes(self) -> dict[str, Any]:
         """Return dominant pollutant and measurement timestamp as attributes."""
         return {
-            "dominant_pollutant": self.coordinator.data.get("dominant_pollutant"),
-            "measurement_timestamp": self.coordinator.data.get("timestamp"),
+            "dominant_pollutant": self.coordinator.data.dominant_pollutant,
+            "measurement_timestamp": self.coordinator.data.timestamp,
+            "restored": self.coordinator.data.restored,
+            "stale": self.coordinator.stale,
         }
 
 
@@ -277,38 +294,76 @@ class MontrealAQIPollutantSensor(MontrealAQIBaseSensor):
     @property
     def native_value(self) -> float | None:
         """Return pollutant concentration value."""
-        pollutants = self.coordinator.data.get("pollutants", {})
-        value = pollutants.get(self._code)
+        return self.coordinator.data.pollutants.get(self._code)
 
-        if value is None:
-            return None
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return AQI sub-index and measurement timestamp as attributes."""
+        return {
+            "sub_index": self.coordinator.data.sub_indices.get(self._code),
+            "measurement_timestamp": self.coordinator.data.timestamp,
+            "restored": self.coordinator.data.restored,
+            "stale": self.coordinator.stale,
+        }
 
-        raw_value = (
-            value.get("concentration")
-            if isinstance(value, dict) and "concentration" in value
-            else value
-        )
 
-        if raw_value is None:
-            return None
+# -------------------------------------------------------------------
+# Rolling pollutant sensors
+# -------------------------------------------------------------------
 
-        try:
-            return float(raw_value)
-        except (ValueError, TypeError):
-            _LOGGER.warning(
-                "Invalid pollutant value for %s (station %s): %s",
-                self._code,
-                self._station_id,
-                value,
-            )
-            return None
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return measurement timestamp as attribute."""
-        return {
-            "measurement_timestamp": self.coordinator.data.get("timestamp"),
+class MontrealAQIRollingSensor(MontrealAQIBaseSensor):
+    """Rolling mean or maximum of a pollutant concentration over some hours."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 0
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: MontrealAQICoordinator,
+        device_info: DeviceInfo,
+        entry_id: str,
+        station_id: str,
+        code: str,
+        meta: dict[str, Any],
+        hours: int,
+        stat: str,
+    ) -> None:
+        """Initialize rolling sensor.
+
+        Args:
+            coordinator: Data coordinator
+            device_info: Device information
+            entry_id: Config entry ID
+            station_id: Station ID
+            code: Pollutant code (e.g., 'PM2.5')
+            meta: Metadata for the pollutant from DEVICE_CLASS_MAP
+            hours: Rolling window, in hours
+            stat: 'mean' or 'max'
+        """
+        super().__init__(coordinator, device_info, entry_id, station_id)
+        self._code = code
+        self._hours = hours
+        self._stat = stat
+        self._attr_translation_key = f"rolling_{stat}"
+        self._attr_translation_placeholders = {
+            "pollutant": code,
+            "hours": str(hours),
         }
+        self._attr_native_unit_of_measurement = meta["unit"]
+        self._attr_icon = meta["icon"]
+        self._attr_device_class = meta.get("device_class")
+        window = (code, hours, stat)
+        self._attr_entity_registry_enabled_default = window in ROLLING_DEFAULT_SENSORS
+        self._attr_unique_id = f"{DOMAIN}_{station_id}_{meta['key']}_{stat}_{hours}h"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the rolling statistic of the pollutant."""
+        if self._stat == "max":
+            return self.coordinator.rolling.max(self._code, self._hours)
+        return self.coordinator.rolling.mean(self._code, self._hours)
 
 
 # -------------------------------------------------------------------
@@ -337,34 +392,126 @@ class MontrealAQITimestampSensor(MontrealAQIBaseSensor):
     @property
     def native_value(self) -> datetime | None:
         """Return timestamp of last measurement."""
-        ts = self.coordinator.data.get("timestamp")
-        if ts is None:
-            return None
+        return self.coordinator.data.timestamp
+
+
+# -------------------------------------------------------------------
+# Diagnostic metric sensors
+# -------------------------------------------------------------------
+
 
-        if isinstance(ts, datetime):
-            return ts
-
-        if isinstance(ts, str):
-            try:
-                parsed = dt_util.parse_datetime(ts)
-                if parsed is None:
-                    _LOGGER.warning(
-                        "Failed to parse timestamp for station %s: %s",
-                        self._station_id,
-                        ts,
-                    )
-                return parsed
-            except Exception as err:
-                _LOGGER.warning(
-                    "Error parsing timestamp for station %s: %s",
-                    self._station_id,
-                    err,
-                )
-                return None
-
-        _LOGGER.warning(
-            "Unexpected timestamp type for station %s: %s",
-            self._station_id,
-            type(ts),
+def _ms(value: float | None) -> float | None:
+    """Convert a duration in seconds to milliseconds."""
+    return round(value * 1000, 1) if value is not None else None
+
+
+@dataclass(frozen=True, kw_only=True)
+class MontrealAQIMetricSensorDescription(SensorEntityDescription):
+    """Description of a fetch metric sensor."""
+
+    value_fn: Callable[[MontrealAQICoordinator], float | int | None]
+
+
+METRIC_SENSORS: tuple[MontrealAQIMetricSensorDescription, ...] = (
+    MontrealAQIMetricSensorDescription(
+        key="fetch_duration",
+        translation_key="fetch_duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: _ms(coordinator.metrics.last_fetch_duration),
+    ),
+    MontrealAQIMetricSensorDescription(
+        key="fetch_latency_p50",
+        translation_key="fetch_latency_p50",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda coordinator: _ms(coordinator.metrics.latency_p50),
+    ),
+    MontrealAQIMetricSensorDescription(
+        key="fetch_latency_p95",
+        translation_key="fetch_latency_p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda coordinator: _ms(coordinator.metrics.latency_p95),
+    ),
+    MontrealAQIMetricSensorDescription(
+        key="fallback_ratio",
+        translation_key="fallback_ratio",
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=0,
+        value_fn=lambda coordinator: (
+            round(ratio * 100, 1)
+            if (ratio := coordinator.metrics.fallback_ratio) is not None
+            else None
+        ),
+    ),
+    MontrealAQIMetricSensorDescription(
+        key="consecutive_failures",
+        translation_key="consecutive_failures",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.metrics.consecutive_failures,
+    ),
+    MontrealAQIMetricSensorDescription(
+        key="deadline_overruns",
+        translation_key="deadline_overruns",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.metrics.deadline_overruns,
+    ),
+    # Received by the shared client, for all stations
+    MontrealAQIMetricSensorDescription(
+        key="data_received",
+        translation_key="data_received",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.api.transport.bytes_received,
+    ),
+)
+
+
+class MontrealAQIMetricSensor(MontrealAQIBaseSensor):
+    """Diagnostic sensor exposing a fetch metric of the station.
+
+    Updated after every fetch, including those not changing the reading.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_has_entity_name = True
+
+    entity_description: MontrealAQIMetricSensorDescription
+
+    def __init__(
+        self,
+        coordinator: MontrealAQICoordinator,
+        device_info: DeviceInfo,
+        entry_id: str,
+        station_id: str,
+        description: MontrealAQIMetricSensorDescription,
+    ) -> None:
+        """Initialize metric sensor."""
+        super().__init__(coordinator, device_info, entry_id, station_id)
+        self.entity_description = description
+        self._attr_unique_id = f"{DOMAIN}_{station_id}_{description.key}"
+
+    @property
+    def available(self) -> bool:
+        """Return True: metrics are meaningful when updates fail."""
+        return True
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the metric value."""
+        return self.entity_description.value_fn(self.coordinator)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Ignore reading updates; metric updates write the state."""
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to metric updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.metrics.async_add_listener(self.async_write_ha_state)
         )
-        return None
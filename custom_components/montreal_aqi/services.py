@@ -0,0 +1,75 @@
+"""Services for Montreal AQI."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_END_DATE,
+    ATTR_START_DATE,
+    CONF_STATION_ID,
+    DOMAIN,
+    SERVICE_BACKFILL,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, ServiceCall
+
+_LOGGER = logging.getLogger(__name__)
+
+BACKFILL_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_STATION_ID): cv.string,
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Montreal AQI services."""
+
+    async def _async_backfill(call: ServiceCall) -> None:
+        """Import the history of a configured station into statistics."""
+        from .api import async_get_api
+        from .statistics import async_backfill_statistics
+
+        station_id: str = call.data[CONF_STATION_ID]
+        start = call.data[ATTR_START_DATE]
+        end = call.data.get(ATTR_END_DATE) or dt_util.now().date()
+        if start > end:
+            raise ServiceValidationError(f"Start date {start} is after end date {end}")
+
+        entry = next(
+            (
+                entry
+                for entry in hass.config_entries.async_entries(DOMAIN)
+                if entry.data[CONF_STATION_ID] == station_id
+            ),
+            None,
+        )
+        if entry is None:
+            raise ServiceValidationError(f"Station {station_id} is not configured")
+
+        api = async_get_api(hass)
+        try:
+            await async_backfill_statistics(
+                hass, api, station_id, entry.title, start, end
+            )
+        except Exception as err:
+            _LOGGER.error(
+                "Failed to backfill station %s: %s", station_id, err, exc_info=True
+            )
+            raise HomeAssistantError(
+                f"Cannot backfill history of station {station_id}"
+            ) from err
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL, _async_backfill, schema=BACKFILL_SCHEMA
+    )
@@ -0,0 +1,97 @@
+"""Long-term statistics backfill for Montreal AQI."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.util import dt as dt_util
+
+from .const import DEVICE_CLASS_MAP, DOMAIN, STATISTICS_IMPORT_BATCH_SIZE
+from .coordinator import convert_pollutants
+
+if TYPE_CHECKING:
+    from datetime import date
+
+    from homeassistant.core import HomeAssistant
+
+    from .api import MontrealAQIApi
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def statistic_id(station_id: str, key: str) -> str:
+    """Return the external statistic ID of a station metric."""
+    return f"{DOMAIN}:station_{station_id}_{key}"
+
+
+async def async_backfill_statistics(
+    hass: HomeAssistant,
+    api: MontrealAQIApi,
+    station_id: str,
+    station_name: str,
+    start: date,
+    end: date,
+) -> int:
+    """Import the hourly history of a station as external statistics.
+
+    AQI and pollutant concentrations are converted like live sensor values
+    and sent to the recorder in batches of STATISTICS_IMPORT_BATCH_SIZE hours.
+
+    Args:
+        hass: Home Assistant instance
+        api: Montreal AQI API wrapper
+        station_id: Station ID
+        station_name: Station name used for the statistic names
+        start: First day to import (inclusive)
+        end: Last day to import (inclusive)
+
+    Returns:
+        Number of hours imported
+    """
+    history = await api.async_get_station_history(station_id, start, end)
+
+    series: dict[str, list[StatisticData]] = {}
+    for station in history:
+        timestamp = dt_util.parse_datetime(str(station.get("timestamp")))
+        if timestamp is None:
+            continue
+
+        values: dict[str, Any] = {"aqi": station.get("aqi")}
+        for code, value in convert_pollutants(station.get("pollutants", {})).items():
+            if code in DEVICE_CLASS_MAP:
+                values[DEVICE_CLASS_MAP[code]["key"]] = value
+
+        for key, value in values.items():
+            if value is None:
+                continue
+            series.setdefault(key, []).append(
+                StatisticData(start=timestamp, mean=value, min=value, max=value)
+            )
+
+    units = {meta["key"]: meta["unit"] for meta in DEVICE_CLASS_MAP.values()}
+    names = {meta["key"]: meta["name"] for meta in DEVICE_CLASS_MAP.values()}
+    for key, statistics in series.items():
+        metadata = StatisticMetaData(
+            has_mean=True,
+            has_sum=False,
+            name=f"{station_name} {names.get(key, 'AQI')}",
+            source=DOMAIN,
+            statistic_id=statistic_id(station_id, key),
+            unit_of_measurement=units.get(key),
+        )
+        for index in range(0, len(statistics), STATISTICS_IMPORT_BATCH_SIZE):
+            async_add_external_statistics(
+                hass,
+                metadata,
+                statistics[index : index + STATISTICS_IMPORT_BATCH_SIZE],
+            )
+
+    _LOGGER.info(
+        "Statistics: imported %d hours of history for station %s",
+        len(history),
+        station_id,
+    )
+    return len(history)
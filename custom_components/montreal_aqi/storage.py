@@ -0,0 +1,153 @@
+"""Persistent storage for Montreal AQI."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    SNAPSHOT_SAVE_DELAY,
+    STATION_LIST_TTL,
+    STORAGE_KEY_ROLLING,
+    STORAGE_KEY_SNAPSHOT,
+    STORAGE_KEY_STATIONS,
+    STORAGE_VERSION,
+)
+from .models import StationReading
+from .rolling import StationRollingStats
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MontrealAQIStationListStore:
+    """Station list persisted between config flows.
+
+    The list is stored with the time it was fetched so the config flow can
+    render it right away and refresh it in the background once it expires.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize station list store.
+
+        Args:
+            hass: Home Assistant instance
+        """
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_STATIONS
+        )
+
+    async def async_load(self) -> tuple[list[dict[str, Any]], datetime] | None:
+        """Load the stored station list.
+
+        Returns:
+            Tuple of (stations, fetched_at), or None if nothing valid is stored
+        """
+        data = await self._store.async_load()
+        if not data:
+            return None
+
+        stations = data.get("stations")
+        fetched_at = dt_util.parse_datetime(data.get("fetched_at") or "")
+        if not isinstance(stations, list) or not stations or fetched_at is None:
+            _LOGGER.debug("Storage: ignoring invalid station list cache")
+            return None
+
+        return stations, fetched_at
+
+    async def async_save(self, stations: list[dict[str, Any]]) -> None:
+        """Store a freshly fetched station list."""
+        await self._store.async_save(
+            {
+                "fetched_at": dt_util.utcnow().isoformat(),
+                "stations": stations,
+            }
+        )
+        _LOGGER.debug("Storage: saved %d stations", len(stations))
+
+    @staticmethod
+    def is_expired(fetched_at: datetime) -> bool:
+        """Return True if a station list fetched at this time should be refreshed."""
+        return dt_util.utcnow() - fetched_at > STATION_LIST_TTL
+
+
+class MontrealAQISnapshotStore:
+    """Last good processed data of a station, restored at startup.
+
+    Restored readings carry ``restored=True`` so entities can tell it apart
+    from live data.
+    """
+
+    def __init__(self, hass: HomeAssistant, station_id: str) -> None:
+        """Initialize snapshot store.
+
+        Args:
+            hass: Home Assistant instance
+            station_id: Station ID
+        """
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_SNAPSHOT.format(station_id=station_id)
+        )
+
+    async def async_load(self) -> StationReading | None:
+        """Load the stored snapshot, or None if nothing valid is stored."""
+        data = await self._store.async_load()
+        if not data or "aqi" not in data:
+            return None
+
+        return StationReading.from_dict(data).as_restored()
+
+    @callback
+    def async_schedule_save(self, reading: StationReading) -> None:
+        """Persist a reading after a short delay, coalescing quick updates."""
+        self._store.async_delay_save(
+            reading.as_dict, SNAPSHOT_SAVE_DELAY.total_seconds()
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the stored snapshot."""
+        await self._store.async_remove()
+
+
+class MontrealAQIRollingStore:
+    """Hourly concentrations of a station kept for its rolling statistics."""
+
+    def __init__(self, hass: HomeAssistant, station_id: str) -> None:
+        """Initialize rolling statistics store.
+
+        Args:
+            hass: Home Assistant instance
+            station_id: Station ID
+        """
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_ROLLING.format(station_id=station_id)
+        )
+
+    async def async_load(self) -> StationRollingStats | None:
+        """Load the stored statistics, or None if nothing valid is stored."""
+        data = await self._store.async_load()
+        if not data:
+            return None
+
+        try:
+            return StationRollingStats.from_dict(data)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            _LOGGER.debug("Storage: ignoring invalid rolling statistics")
+            return None
+
+    @callback
+    def async_schedule_save(self, stats: StationRollingStats) -> None:
+        """Persist the statistics after a short delay, coalescing updates."""
+        self._store.async_delay_save(stats.as_dict, SNAPSHOT_SAVE_DELAY.total_seconds())
+
+    async def async_remove(self) -> None:
+        """Remove the stored statistics."""
+        await self._store.async_remove()
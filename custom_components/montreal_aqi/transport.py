@@ -0,0 +1,281 @@
+"""HTTP transports used by the Montreal AQI API client."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    API_TIMEOUT,
+    CONNECTION_LIMIT_PER_HOST,
+    DATA_SESSION,
+    DATA_SESSION_CLOSE_LISTENER,
+    DNS_CACHE_TTL,
+    KEEPALIVE_TIMEOUT,
+    RECORDING_MAX_EXCHANGES,
+    RECORDING_SAVE_DELAY,
+    RECORDING_VERSION,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from datetime import datetime
+    from pathlib import Path
+
+    from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant
+    from homeassistant.util.json import JsonValueType
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MontrealAQIReplayError(Exception):
+    """Error to indicate a request has no recorded response to replay."""
+
+
+@callback
+def async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the pooled aiohttp session shared by all Montreal AQI requests.
+
+    The session keeps connections to the open data portal alive between
+    requests, caches DNS lookups and caps connections per host. It is closed
+    when the last config entry unloads or when Home Assistant stops.
+    """
+    session: aiohttp.ClientSession | None = hass.data.get(DATA_SESSION)
+    if session is not None and not session.closed:
+        return session
+
+    connector = aiohttp.TCPConnector(
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    new_session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=API_TIMEOUT),
+    )
+    hass.data[DATA_SESSION] = new_session
+
+    if DATA_SESSION_CLOSE_LISTENER not in hass.data:
+
+        async def _async_handle_close(_event: Event) -> None:
+            # The listener is removed once fired, it must not be removed again
+            hass.data.pop(DATA_SESSION_CLOSE_LISTENER, None)
+            await async_close_session(hass)
+
+        hass.data[DATA_SESSION_CLOSE_LISTENER] = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, _async_handle_close
+        )
+    _LOGGER.debug("API: Created pooled session for the open data portal")
+    return new_session
+
+
+async def async_close_session(hass: HomeAssistant) -> None:
+    """Close the pooled session, if any, and stop listening for shutdown."""
+    unsub: CALLBACK_TYPE | None = hass.data.pop(DATA_SESSION_CLOSE_LISTENER, None)
+    if unsub is not None:
+        unsub()
+    session: aiohttp.ClientSession | None = hass.data.pop(DATA_SESSION, None)
+    if session is not None and not session.closed:
+        _LOGGER.debug("API: Closing pooled session")
+        await session.close()
+
+
+def _request_key(url: str, params: Mapping[str, str]) -> str:
+    """Return a stable key identifying a request."""
+    return json.dumps([url, sorted(params.items())])
+
+
+class MontrealAQITransport(ABC):
+    """Perform GET requests returning JSON for the API client.
+
+    Transports count the size of the response bodies they receive.
+    """
+
+    def __init__(self) -> None:
+        """Initialize transport."""
+        self.bytes_received = 0
+
+    @abstractmethod
+    async def async_get_json(
+        self, url: str, params: Mapping[str, str]
+    ) -> JsonValueType:
+        """Send a GET request and return the decoded JSON body.
+
+        Raises:
+            aiohttp.ClientError: If the request fails
+        """
+
+
+class AiohttpTransport(MontrealAQITransport):
+    """Transport sending requests to the open data portal with aiohttp."""
+
+    def __init__(
+        self, hass: HomeAssistant, session: aiohttp.ClientSession | None = None
+    ) -> None:
+        """Initialize transport.
+
+        Args:
+            hass: Home Assistant instance
+            session: aiohttp session to use, defaults to the integration's
+                pooled session
+        """
+        super().__init__()
+        self.hass = hass
+        self._session = session
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the aiohttp session used for requests."""
+        if self._session is not None:
+            return self._session
+        return async_get_session(self.hass)
+
+    async def async_get_json(
+        self, url: str, params: Mapping[str, str]
+    ) -> JsonValueType:
+        """Send a GET request and return the decoded JSON body."""
+        async with self.session.get(
+            url,
+            params=params,
+            timeout=aiohttp.ClientTimeout(total=API_TIMEOUT),
+        ) as resp:
+            resp.raise_for_status()
+            body = await resp.read()
+            self.bytes_received += len(body)
+            payload: JsonValueType = await resp.json()
+            return payload
+
+
+class RecordingTransport(MontrealAQITransport):
+    """Transport recording the responses of another transport.
+
+    Successful responses are kept with their latency, to be served later by
+    ReplayTransport. Only the last RECORDING_MAX_EXCHANGES responses are kept,
+    and they are written to a JSON file RECORDING_SAVE_DELAY after a new one
+    is recorded, so a long recording neither grows unbounded in memory nor is
+    lost if Home Assistant does not stop cleanly.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, transport: MontrealAQITransport, path: Path
+    ) -> None:
+        """Initialize transport.
+
+        Args:
+            hass: Home Assistant instance
+            transport: Transport performing the real requests
+            path: File the recording is written to
+        """
+        super().__init__()
+        self.hass = hass
+        self.transport = transport
+        self.path = path
+        self._exchanges: deque[dict[str, Any]] = deque(maxlen=RECORDING_MAX_EXCHANGES)
+        self._unsub_save: CALLBACK_TYPE | None = None
+
+    async def async_get_json(
+        self, url: str, params: Mapping[str, str]
+    ) -> JsonValueType:
+        """Send a GET request through the wrapped transport and record it."""
+        start = time.monotonic()
+        bytes_before = self.transport.bytes_received
+        payload = await self.transport.async_get_json(url, params)
+        size = self.transport.bytes_received - bytes_before
+        self.bytes_received += size
+        self._exchanges.append(
+            {
+                "url": url,
+                "params": dict(params),
+                "latency": round(time.monotonic() - start, 4),
+                "size": size,
+                "payload": payload,
+            }
+        )
+        self.async_schedule_save()
+        return payload
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Schedule writing the recorded responses to disk."""
+        if self._unsub_save is None:
+            self._unsub_save = async_call_later(
+                self.hass, RECORDING_SAVE_DELAY, self._async_handle_save
+            )
+
+    async def _async_handle_save(self, _now: datetime) -> None:
+        """Write the recorded responses once the save delay has elapsed."""
+        self._unsub_save = None
+        await self.async_save()
+
+    async def async_save(self) -> None:
+        """Write the recorded responses to disk, cancelling a pending save."""
+        if self._unsub_save is not None:
+            self._unsub_save()
+            self._unsub_save = None
+        data = {"version": RECORDING_VERSION, "exchanges": list(self._exchanges)}
+        await self.hass.async_add_executor_job(
+            self.path.write_text, json.dumps(data), "utf-8"
+        )
+        _LOGGER.debug(
+            "API: Saved %d recorded responses to %s", len(self._exchanges), self.path
+        )
+
+
+class ReplayTransport(MontrealAQITransport):
+    """Transport serving responses from a recording, without network access.
+
+    Responses recorded for the same request are served in order; the last one
+    keeps being served once the others are used. Recorded latencies can be
+    replayed to reproduce production timing.
+    """
+
+    def __init__(
+        self, exchanges: list[dict[str, Any]], replay_latency: bool = False
+    ) -> None:
+        """Initialize transport.
+
+        Args:
+            exchanges: Recorded exchanges, as written by RecordingTransport
+            replay_latency: Wait for the recorded latency before responding
+        """
+        super().__init__()
+        self.replay_latency = replay_latency
+        self._responses: dict[str, deque[dict[str, Any]]] = {}
+        for exchange in exchanges:
+            key = _request_key(exchange["url"], exchange["params"])
+            self._responses.setdefault(key, deque()).append(exchange)
+
+    @classmethod
+    async def async_from_file(
+        cls, hass: HomeAssistant, path: Path, replay_latency: bool = False
+    ) -> ReplayTransport:
+        """Load a recording written by RecordingTransport."""
+        raw = await hass.async_add_executor_job(path.read_text, "utf-8")
+        data = json.loads(raw)
+        if data.get("version") != RECORDING_VERSION:
+            raise MontrealAQIReplayError(f"Unsupported recording version in {path}")
+        return cls(data["exchanges"], replay_latency)
+
+    async def async_get_json(
+        self, url: str, params: Mapping[str, str]
+    ) -> JsonValueType:
+        """Return the recorded response of a request."""
+        responses = self._responses.get(_request_key(url, params))
+        if not responses:
+            raise MontrealAQIReplayError(f"No recorded response for {url} {params}")
+
+        exchange = responses.popleft() if len(responses) > 1 else responses[0]
+        if self.replay_latency:
+            await asyncio.sleep(exchange["latency"])
+        self.bytes_received += exchange.get("size", 0)
+        return exchange["payload"]
@@ -0,0 +1,319 @@
+"""Performance benchmarks for the coordinator and sensor hot paths.
+
+Opt-in: set MONTREAL_AQI_BENCHMARK_OUTPUT to the JSON file receiving the
+results, e.g.::
+
+    MONTREAL_AQI_BENCHMARK_OUTPUT=benchmark.json pytest tests/benchmarks -m slow
+
+Update cycles run against a local stand-in for the Ckan datastore_search
+endpoint, served over HTTP from a separate thread so the event loop under
+test only runs integration code.
+"""
+
+import asyncio
+import json
+import os
+import platform
+import statistics
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aiohttp import web
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.core import HomeAssistant
+
+from custom_components.montreal_aqi.api import MontrealAQIApi
+from custom_components.montreal_aqi.const import RESOURCE_ID_AQI_HISTORY
+from custom_components.montreal_aqi.coordinator import MontrealAQICoordinator
+from custom_components.montreal_aqi.coordinator import MontrealAQINetworkCoordinator
+from custom_components.montreal_aqi.coordinator import convert_pollutants
+from custom_components.montreal_aqi.models import StationReading
+from custom_components.montreal_aqi.sensor import MontrealAQIPollutantSensor
+
+OUTPUT = os.environ.get("MONTREAL_AQI_BENCHMARK_OUTPUT")
+
+pytestmark = [
+    pytest.mark.slow,
+    pytest.mark.skipif(
+        not OUTPUT, reason="set MONTREAL_AQI_BENCHMARK_OUTPUT to run benchmarks"
+    ),
+]
+
+STATION_COUNTS = (1, 10, 50, 200)
+MEASURED_CYCLES = 5
+MICRO_ITERATIONS = 20000
+
+POLLUTANTS = ("PM", "O3", "NO2", "SO2", "CO")
+# Below MIN_REQUIRED_POLLUTANTS and without PM/O3: needs the fallback source
+SPARSE_POLLUTANTS = ("NO2", "CO")
+# Share of stations reporting SPARSE_POLLUTANTS in the fallback scenario
+SPARSE_RATIO = 0.25
+HOURS = (11, 12, 13)
+
+RESULTS: dict[str, Any] = {}
+
+
+def _realtime_records(
+    station_count: int, sparse_count: int = 0
+) -> list[dict[str, str]]:
+    """Build realtime RSQA records: every pollutant of every station and hour.
+
+    The last sparse_count stations only report SPARSE_POLLUTANTS.
+    """
+    return [
+        {
+            "stationId": str(station),
+            "date": "2025-01-15",
+            "heure": str(hour),
+            "pollutant": pollutant,
+            "valeur": str(10 + (station + index) % 40),
+        }
+        for station in range(1, station_count + 1)
+        for hour in HOURS
+        for index, pollutant in enumerate(
+            SPARSE_POLLUTANTS
+            if station > station_count - sparse_count
+            else POLLUTANTS
+        )
+    ]
+
+
+def _history_records(station_count: int) -> list[dict[str, str]]:
+    """Build history RSQA records, most recent hour first as sorted by Ckan."""
+    return [
+        {
+            "stationId": str(station),
+            "date": "2025-01-15",
+            "heure": str(hour),
+            "pollutant": pollutant,
+            "valeur": str(10 + (station + index) % 40),
+        }
+        for hour in reversed(HOURS)
+        for station in range(1, station_count + 1)
+        for index, pollutant in enumerate(POLLUTANTS)
+    ]
+
+
+class _CkanStandIn:
+    """Local datastore_search endpoint served from its own thread and loop."""
+
+    def __init__(self, station_count: int, sparse_count: int = 0) -> None:
+        self.records = _realtime_records(station_count, sparse_count)
+        self.history = _history_records(station_count) if sparse_count else []
+        self.url = ""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="ckan-stand-in")
+        self._started = threading.Event()
+        self._runner: web.AppRunner | None = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        filters = json.loads(request.query.get("filters", "{}"))
+        records = (
+            self.history
+            if request.query.get("resource_id") == RESOURCE_ID_AQI_HISTORY
+            else self.records
+        )
+        for field, values in filters.items():
+            wanted = set(values) if isinstance(values, list) else {values}
+            records = [r for r in records if r[field] in wanted]
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query.get("limit", 100))
+        return web.json_response(
+            {"success": True, "result": {"records": records[offset : offset + limit]}}
+        )
+
+    async def _start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/datastore_search", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}/datastore_search"
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._start())
+        self._started.set()
+        self._loop.run_forever()
+
+    def __enter__(self) -> "_CkanStandIn":
+        self._thread.start()
+        self._started.wait()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        assert self._runner is not None
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+def _summary(values: list[float]) -> dict[str, float]:
+    return {
+        "min": round(min(values), 3),
+        "median": round(statistics.median(values), 3),
+        "max": round(max(values), 3),
+    }
+
+
+async def _run_cycles(
+    hass: HomeAssistant, station_count: int, sparse_count: int = 0
+) -> dict[str, Any]:
+    """Measure network update cycles fanned out to every station coordinator.
+
+    With sparse_count, that many stations go through the fallback source. Its
+    caches are cleared before each cycle, as on the first cycle of an hour,
+    so every measured cycle fetches the fallback batch.
+    """
+    with _CkanStandIn(station_count, sparse_count) as stand_in, patch(
+        "custom_components.montreal_aqi.api.API_URL", stand_in.url
+    ):
+        session = aiohttp.ClientSession()
+        api = MontrealAQIApi(hass, session=session)
+        network = MontrealAQINetworkCoordinator(hass, api)
+        coordinators = []
+        unsubs = []
+        for station in range(1, station_count + 1):
+            station_id = str(station)
+            network.async_add_station(station_id)
+            coordinator = MontrealAQICoordinator(
+                hass, api, station_id, network=network
+            )
+            coordinators.append(coordinator)
+            unsubs.append(
+                network.async_add_listener(coordinator.async_handle_network_update)
+            )
+
+        async def _cycle() -> None:
+            if sparse_count:
+                api._fallback_cache.clear()
+                api._fallback_batches.clear()
+            await network.async_refresh()
+            await hass.async_block_till_done()
+
+        try:
+            # Warm up connections and caches
+            await _cycle()
+            assert all(c.data is not None for c in coordinators)
+            assert (
+                sum(1 for c in coordinators if c.metrics.fallback_updates)
+                == sparse_count
+            )
+
+            latencies: list[float] = []
+            loop_cpu: list[float] = []
+            for _ in range(MEASURED_CYCLES):
+                wall_start = time.perf_counter()
+                cpu_start = time.thread_time()
+                await _cycle()
+                loop_cpu.append((time.thread_time() - cpu_start) * 1000)
+                latencies.append((time.perf_counter() - wall_start) * 1000)
+
+            tracemalloc.start()
+            await _cycle()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        finally:
+            for unsub in unsubs:
+                unsub()
+            await network.async_shutdown()
+            await session.close()
+
+    return {
+        "stations": station_count,
+        "fallback_stations": sparse_count,
+        "cycle_latency_ms": _summary(latencies),
+        "loop_cpu_ms": _summary(loop_cpu),
+        "loop_cpu_per_station_ms": round(
+            statistics.median(loop_cpu) / station_count, 4
+        ),
+        "allocated_kib": round(current / 1024, 1),
+        "peak_allocated_kib": round(peak / 1024, 1),
+    }
+
+
+def _time_per_call(func: Callable[[], object]) -> float:
+    """Return the mean time of a call in microseconds."""
+    start = time.perf_counter()
+    for _ in range(MICRO_ITERATIONS):
+        func()
+    return round((time.perf_counter() - start) / MICRO_ITERATIONS * 1e6, 3)
+
+
+@pytest.mark.parametrize("station_count", STATION_COUNTS)
+async def test_benchmark_update_cycle(
+    hass: HomeAssistant, socket_enabled: None, station_count: int
+) -> None:
+    """Benchmark a full update cycle for a number of stations."""
+    RESULTS.setdefault("update_cycle", []).append(
+        await _run_cycles(hass, station_count)
+    )
+
+
+@pytest.mark.parametrize("station_count", STATION_COUNTS)
+async def test_benchmark_update_cycle_with_fallback(
+    hass: HomeAssistant, socket_enabled: None, station_count: int
+) -> None:
+    """Benchmark an update cycle where some stations need the fallback source."""
+    sparse_count = max(1, int(station_count * SPARSE_RATIO))
+    RESULTS.setdefault("update_cycle_fallback", []).append(
+        await _run_cycles(hass, station_count, sparse_count)
+    )
+
+
+async def test_benchmark_hot_paths(hass: HomeAssistant) -> None:
+    """Benchmark pollutant conversion and sensor state reads."""
+    payload = {
+        "PM2.5": {"name": "PM2.5", "aqi": 42, "concentration": 14.7},
+        "O3": {"name": "O3", "aqi": 20, "concentration": 32.0},
+        "NO2": {"name": "NO2", "aqi": 8, "concentration": 32.0},
+        "SO2": {"name": "SO2", "aqi": 2, "concentration": 10.0},
+        "CO": {"name": "CO", "aqi": 1, "concentration": 0.35},
+    }
+    coordinator = MagicMock()
+    coordinator.data = StationReading(
+        aqi=42, dominant_pollutant="PM2.5", pollutants=convert_pollutants(payload)
+    )
+    sensor = MontrealAQIPollutantSensor(
+        coordinator=coordinator,
+        device_info=MagicMock(),
+        entry_id="",
+        station_id="80",
+        code="NO2",
+        meta={"key": "no2", "unit": "µg/m³", "icon": "mdi:molecule"},
+    )
+
+    RESULTS["hot_paths_us"] = {
+        "convert_pollutants": _time_per_call(lambda: convert_pollutants(payload)),
+        "pollutant_sensor_native_value": _time_per_call(lambda: sensor.native_value),
+    }
+
+
+def test_benchmark_write_results() -> None:
+    """Write collected results for comparison between releases."""
+    assert OUTPUT is not None
+    Path(OUTPUT).write_text(
+        json.dumps(
+            {
+                "created": datetime.now(UTC).isoformat(),
+                "python": platform.python_version(),
+                "homeassistant": HA_VERSION,
+                **RESULTS,
+            },
+            indent=2,
+        )
+        + "\n"
+    )
@@ -0,0 +1,396 @@
+"""Tests for the native async API client."""
+
+import asyncio
+from datetime import date
+
+import pytest
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from custom_components.montreal_aqi.api import ExecutorLimit
+from custom_components.montreal_aqi.api import MontrealAQIApi
+from custom_components.montreal_aqi.api import MontrealAQIApiError
+from custom_components.montreal_aqi.const import API_URL
+from custom_components.montreal_aqi.const import CONNECTION_LIMIT_PER_HOST
+from custom_components.montreal_aqi.const import DATA_FETCH_LIMIT
+from custom_components.montreal_aqi.const import DATA_SESSION
+from custom_components.montreal_aqi.const import DATA_SESSION_CLOSE_LISTENER
+from custom_components.montreal_aqi.transport import async_close_session
+from custom_components.montreal_aqi.transport import async_get_session
+
+
+def _ckan(records):
+    return {"success": True, "result": {"records": records}}
+
+
+REALTIME_RECORDS = [
+    {"stationId": "80", "date": "2025-01-15", "heure": "12", "pollutant": "PM", "valeur": "30"},
+    {"stationId": "80", "date": "2025-01-15", "heure": "13", "pollutant": "PM", "valeur": "42"},
+    {"stationId": "80", "date": "2025-01-15", "heure": "13", "pollutant": "O3", "valeur": "20"},
+    {"stationId": "80", "date": "2025-01-15", "heure": "13", "pollutant": "NO2", "valeur": "8"},
+    {"stationId": "39", "date": "2025-01-15", "heure": "9", "pollutant": "O3", "valeur": "17"},
+    {"stationId": "39", "date": "2025-01-15", "heure": "10", "pollutant": "O3", "valeur": "11"},
+]
+
+
+async def test_native_get_station(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+):
+    """Test station data is parsed like Station.to_dict()."""
+    aioclient_mock.get(API_URL, json=_ckan(REALTIME_RECORDS[:4]))
+    api = MontrealAQIApi(hass, session=async_get_clientsession(hass))
+
+    data = await api.async_get_station("80")
+
+    assert data == {
+        "station_id": "80",
+        "date": "2025-01-15",
+        "hour": 13,
+        "timestamp": "2025-01-15T13:00:00-05:00",
+        "aqi": 42,
+        "dominant_pollutant": "PM2.5",
+        "pollutants": {
+            "PM2.5": {"name": "PM2.5", "aqi": 42, "concentration": 14.7},
+            "O3": {"name": "O3", "aqi": 20, "concentration": 32.0},
+            "NO2": {"name": "NO2", "aqi": 8, "concentration": 32.0},
+        },
+    }
+    assert aioclient_mock.call_count == 1
+
+
+async def test_native_get_stations_single_request(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+):
+    """Test all stations are fetched in one request and split locally."""
+    aioclient_mock.get(API_URL, json=_ckan(REALTIME_RECORDS))
+    api = MontrealAQIApi(hass, session=async_get_clientsession(hass))
+
+    data = await api.async_get_stations(["39", "80", "99"])
+
+    assert aioclient_mock.call_count == 1
+    assert data["80"]["aqi"] == 42
+    assert data["39"]["hour"] == 10
+    assert data["39"]["aqi"] == 11
+    assert data["99"] is None
+
+
+async def test_native_list_stations(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+):
+    """Test station list records are mapped to station dictionaries."""
+    aioclient_mock.get(
+        API_URL,
+        json=_ckan(
+            [
+                {
+                    "numero_station": "80",
+                    "nom": "Downtown",
+                    "adresse": "1 rue",
+                    "arrondissement_ville": "Ville-Marie",
+                }
+            ]
+        ),
+    )
+    api = MontrealAQIApi(hass, session=async_get_clientsession(hass))
+
+    stations = await api.async_list_stations()
+
+    assert stations == [
+        {
+            "station_id": "80",
+            "name": "Downtown",
+            "address": "1 rue",
+            "borough": "Ville-Marie",
+        }
+    ]
+
+
+async def test_native_unsuccessful_response(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+):
+    """Test an unsuccessful Ckan response raises."""
+    aioclient_mock.get(API_URL, json={"success": False})
+    api = MontrealAQIApi(hass, session=async_get_clientsession(hass))
+
+    with pytest.raises(MontrealAQIApiError):
+        await api.async_get_station("80")
+
+
+async def test_concurrent_requests_coalesced(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+):
+    """Test concurrent identical requests share one in-flight request."""
+    aioclient_mock.get(API_URL, json=_ckan(REALTIME_RECORDS[:4]))
+    api = MontrealAQIApi(hass, session=async_get_clientsession(hass))
+
+    first, second, other = await asyncio.gather(
+        api.async_get_station("80"),
+        api.async_get_station("80"),
+        api.async_get_stations(["80"]),
+    )
+
+    assert aioclient_mock.call_count == 2
+    assert first == second
+    assert first is not second
+    assert other["80"] == first
+
+    # Completed requests are not reused
+    await api.async_get_station("80")
+    assert aioclient_mock.call_count == 3
+
+
+async def test_library_calls_bounded(hass: HomeAssistant):
+    """Test blocking library calls are limited domain-wide and their wait tracked."""
+    hass.data[DATA_FETCH_LIMIT] = ExecutorLimit(2)
+    first = MontrealAQIApi(hass, use_library=True)
+    second = MontrealAQIApi(hass, use_library=True)
+    running = 0
+    peak = 0
+
+    async def _fake_executor_job(target, *args):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return target(*args)
+
+    hass.async_add_executor_job = _fake_executor_job
+
+    results = await asyncio.gather(
+        *(
+            api._async_add_executor_job(str, index)
+            for api in (first, second)
+            for index in range(3)
+        )
+    )
+
+    assert results == ["0", "1", "2", "0", "1", "2"]
+    assert peak == 2
+    assert first.executor_limit is second.executor_limit
+    assert first.executor_limit.queue_wait.jobs == 6
+    assert first.executor_limit.queue_wait.p95 >= 0.01
+
+
+async def test_pooled_session_shared_and_closed(hass: HomeAssistant):
+    """Test all API instances share one pooled session until it is closed."""
+    first = MontrealAQIApi(hass)
+    second = MontrealAQIApi(hass)
+
+    session = first.transport.session
+    assert second.transport.session is session
+    assert hass.data[DATA_SESSION] is session
+    assert session.connector.limit_per_host == CONNECTION_LIMIT_PER_HOST
+
+    await async_close_session(hass)
+
+    assert session.closed
+    assert DATA_SESSION not in hass.data
+    assert DATA_SESSION_CLOSE_LISTENER not in hass.data
+    # A new session is created on next use
+    new_session = async_get_session(hass)
+    assert new_session is not session
+    await async_close_session(hass)
+
+
+async def test_pooled_session_close_listener_registered_once(hass: HomeAssistant):
+    """Test the shutdown listener is registered once and removed on close."""
+    listeners = hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_CLOSE, 0)
+
+    session = async_get_session(hass)
+    await session.close()
+    # A closed session is replaced without registering another listener
+    new_session = async_get_session(hass)
+
+    assert new_session is not session
+    assert hass.bus.async_listeners()[EVENT_HOMEASSISTANT_CLOSE] == listeners + 1
+
+    await async_close_session(hass)
+
+    assert new_session.closed
+    assert hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_CLOSE, 0) == listeners
+
+
+async def test_pooled_session_closed_on_shutdown(hass: HomeAssistant):
+    """Test the pooled session is closed when Home Assistant stops."""
+    session = async_get_session(hass)
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+
+    assert session.closed
+    assert DATA_SESSION not in hass.data
+    assert DATA_SESSION_CLOSE_LISTENER not in hass.data
+
+
+async def test_fallback_uses_api_session(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+):
+    """Test the Ckan fallback goes through the shared session."""
+    aioclient_mock.get(
+        API_URL,
+        json=_ckan([{"stationId": "80", "valeur": "55", "pollutant": "O3"}]),
+    )
+    api = MontrealAQIApi(hass, session=async_get_clientsession(hass))
+
+    result = await api.async_get_aqi_fallback("80", "13")
+
+    assert result == {"aqi": 55, "dominant_pollutant": "O3"}
+    assert aioclient_mock.call_count == 1
+
+
+async def test_fallback_batched_across_stations(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+):
+    """Test one Ckan request serves the fallback of every station in a cycle."""
+    aioclient_mock.get(
+        API_URL,
+        json=_ckan(
+            [
+                {"stationId": "80", "date": "2025-01-15", "heure": "13", "valeur": "30", "pollutant": "NO2"},
+                {"stationId": "80", "date": "2025-01-15", "heure": "13", "valeur": "55", "pollutant": "O3"},
+                {"stationId": "39", "date": "2025-01-15", "heure": "13", "valeur": "21", "pollutant": "PM"},
+                {"stationId": "80", "date": "2025-01-14", "heure": "13", "valeur": "99", "pollutant": "PM"},
+            ]
+        ),
+    )
+    api = MontrealAQIApi(hass, session=async_get_clientsession(hass))
+
+    assert await api.async_get_aqi_fallback("80", "13") == {
+        "aqi": 55,
+        "dominant_pollutant": "O3",
+    }
+    assert await api.async_get_aqi_fallback("39", "13") == {
+        "aqi": 21,
+        "dominant_pollutant": "PM",
+    }
+    assert await api.async_get_aqi_fallback("50", "13") is None
+
+    assert aioclient_mock.call_count == 1
+    _, url, _, _ = aioclient_mock.mock_calls[0]
+    assert url.query["fields"] == "stationId,date,heure,pollutant,valeur"
+    assert url.query["filters"] == '{"heure": "13"}'
+
+
+async def test_fallback_cached_per_station_hour(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+):
+    """Test repeat fallbacks for the same hour make no network call."""
+    aioclient_mock.get(
+        API_URL,
+        json=_ckan(
+            [{"stationId": "80", "date": "2025-01-15", "heure": "13", "valeur": "55", "pollutant": "O3"}]
+        ),
+    )
+    api = MontrealAQIApi(hass, session=async_get_clientsession(hass))
+
+    assert (await api.async_get_aqi_fallback("80", "13"))["aqi"] == 55
+    # Drop the cycle batch: only the per-station cache is left
+    api._fallback_batches.clear()
+    assert (await api.async_get_aqi_fallback("80", "13"))["aqi"] == 55
+    assert await api.async_get_aqi_fallback("39", "13") is None
+    assert aioclient_mock.call_count == 2
+
+    # Negative result is cached too
+    assert await api.async_get_aqi_fallback("39", "13") is None
+    assert aioclient_mock.call_count == 2
+
+
+async def test_fallback_error_cached_briefly(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+):
+    """Test a failed fallback is not retried on the next tick."""
+    aioclient_mock.get(API_URL, status=500)
+    api = MontrealAQIApi(hass, session=async_get_clientsession(hass))
+
+    assert await api.async_get_aqi_fallback("80", "13") is None
+    assert await api.async_get_aqi_fallback("80", "13") is None
+    assert aioclient_mock.call_count == 1
+
+
+async def test_station_history_paged_until_start_date(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, monkeypatch
+):
+    """Test history pages back until the start date and keeps the range only."""
+    monkeypatch.setattr("custom_components.montreal_aqi.api.BACKFILL_PAGE_SIZE", 3)
+    aioclient_mock.get(
+        API_URL,
+        params={"offset": "3"},
+        json=_ckan(
+            [
+                {"stationId": "80", "date": "2025-01-14", "heure": "22", "pollutant": "NO2", "valeur": "10"},
+                {"stationId": "80", "date": "2025-01-13", "heure": "23", "pollutant": "PM", "valeur": "99"},
+            ]
+        ),
+    )
+    aioclient_mock.get(
+        API_URL,
+        json=_ckan(
+            [
+                {"stationId": "80", "date": "2025-01-15", "heure": "0", "pollutant": "O3", "valeur": "40"},
+                {"stationId": "80", "date": "2025-01-14", "heure": "23", "pollutant": "PM", "valeur": "30"},
+                {"stationId": "80", "date": "2025-01-14", "heure": "23", "pollutant": "O3", "valeur": "20"},
+            ]
+        ),
+    )
+    api = MontrealAQIApi(hass, session=async_get_clientsession(hass))
+
+    history = await api.async_get_station_history(
+        "80", date(2025, 1, 14), date(2025, 1, 14)
+    )
+
+    assert [(h["timestamp"], h["aqi"]) for h in history] == [
+        ("2025-01-14T22:00:00-05:00", 10),
+        ("2025-01-14T23:00:00-05:00", 30),
+    ]
+    assert history[1]["dominant_pollutant"] == "PM2.5"
+    assert aioclient_mock.call_count == 2
+    _, url, _, _ = aioclient_mock.mock_calls[0]
+    assert url.query["filters"] == '{"stationId": "80"}'
+    assert url.query["sort"] == "date desc, heure desc, _id desc"
+
+
+async def test_datastore_iterator_follows_pages(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+):
+    """Test records are yielded page by page until a short page."""
+    aioclient_mock.get(
+        API_URL, params={"offset": "2"}, json=_ckan(REALTIME_RECORDS[2:3])
+    )
+    aioclient_mock.get(API_URL, json=_ckan(REALTIME_RECORDS[:2]))
+    api = MontrealAQIApi(hass, session=async_get_clientsession(hass))
+
+    records = [
+        record
+        async for record in api._async_iter_datastore("resource", page_size=2)
+    ]
+
+    assert records == REALTIME_RECORDS[:3]
+    assert aioclient_mock.call_count == 2
+    _, url, _, _ = aioclient_mock.mock_calls[1]
+    assert url.query["limit"] == "2"
+    assert url.query["offset"] == "2"
+
+
+async def test_datastore_iterator_max_records(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+):
+    """Test no page is requested past max_records."""
+    aioclient_mock.get(API_URL, json=_ckan(REALTIME_RECORDS[:3]))
+    api = MontrealAQIApi(hass, session=async_get_clientsession(hass))
+
+    records = [
+        record
+        async for record in api._async_iter_datastore(
+            "resource", page_size=5, max_records=3
+        )
+    ]
+
+    assert len(records) == 3
+    assert aioclient_mock.call_count == 1
+    _, url, _, _ = aioclient_mock.mock_calls[0]
+    assert url.query["limit"] == "3"
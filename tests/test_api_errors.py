@@ -10,7 +10,7 @@ from custom_components.montreal_aqi.api import MontrealAQIApi
 
 async def test_api_list_stations_error(hass: HomeAssistant):
     """Test API error handling when listing stations fails."""
-    api = MontrealAQIApi(hass)
+    api = MontrealAQIApi(hass, use_library=True)
 
     async def mock_list_stations_error(*args, **kwargs):  # noqa: ARG001
         raise RuntimeError("API connection failed")
@@ -23,7 +23,7 @@ async def test_api_list_stations_error(hass: HomeAssistant):
 
 async def test_api_list_stations_invalid_response(hass: HomeAssistant):
     """Test API handling of invalid response type."""
-    api = MontrealAQIApi(hass)
+    api = MontrealAQIApi(hass, use_library=True)
 
     async def mock_invalid_response(*args, **kwargs):  # noqa: ARG001
         return "not a list"
@@ -36,7 +36,7 @@ async def test_api_list_stations_invalid_response(hass: HomeAssistant):
 
 async def test_api_get_station_not_found(hass: HomeAssistant):
     """Test API handling when station is not found."""
-    api = MontrealAQIApi(hass)
+    api = MontrealAQIApi(hass, use_library=True)
 
     async def mock_station_not_found(*args, **kwargs):  # noqa: ARG001
         return None
@@ -49,7 +49,7 @@ async def test_api_get_station_not_found(hass: HomeAssistant):
 
 async def test_api_get_station_error(hass: HomeAssistant):
     """Test API error handling when getting station fails."""
-    api = MontrealAQIApi(hass)
+    api = MontrealAQIApi(hass, use_library=True)
 
     async def mock_get_station_error(*args, **kwargs):  # noqa: ARG001
         raise RuntimeError("API error")
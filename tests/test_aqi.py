@@ -0,0 +1,35 @@
+"""Tests for the local AQI computation."""
+
+from custom_components.montreal_aqi.aqi import compute_aqi
+from custom_components.montreal_aqi.aqi import sub_index
+
+
+def test_sub_index_from_reference_value():
+    # 17.5 µg/m³ of PM2.5 is half its reference value
+    assert sub_index("PM2.5", 17.5) == 50
+    assert sub_index("XYZ", 10) is None
+
+
+def test_compute_aqi_dominant_pollutant():
+    result = compute_aqi(
+        {
+            "PM2.5": {"name": "PM2.5", "aqi": 42, "concentration": 14.7},
+            "O3": {"concentration": 80.0},
+            "NO2": {"concentration": None},
+            "SO2": "bogus",
+        }
+    )
+
+    assert result.sub_indices == {"PM2.5": 42, "O3": 50}
+    assert result.aqi == 50
+    assert result.dominant_pollutant == "O3"
+    assert result.reliable
+
+
+def test_compute_aqi_reliability():
+    assert not compute_aqi({"PM2.5": 12, "NO2": 30}).reliable
+    assert compute_aqi({"PM2.5": 12, "NO2": 30, "SO2": 5}).reliable
+
+    empty = compute_aqi({})
+    assert empty.aqi is None
+    assert not empty.reliable
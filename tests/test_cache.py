@@ -0,0 +1,41 @@
+"""Tests for the in-memory TTL cache."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from custom_components.montreal_aqi.cache import TTLCache
+
+_MISSING = object()
+
+
+def test_cache_expires_entries():
+    cache: TTLCache[str, int] = TTLCache(max_size=4)
+
+    with patch("custom_components.montreal_aqi.cache.time.monotonic", return_value=0):
+        cache.set("a", 1, timedelta(seconds=10))
+    with patch("custom_components.montreal_aqi.cache.time.monotonic", return_value=5):
+        assert cache.get("a", _MISSING) == 1
+    with patch("custom_components.montreal_aqi.cache.time.monotonic", return_value=10):
+        assert cache.get("a", _MISSING) is _MISSING
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache: TTLCache[str, int] = TTLCache(max_size=2)
+    ttl = timedelta(minutes=1)
+
+    cache.set("a", 1, ttl)
+    cache.set("b", 2, ttl)
+    assert cache.get("a", None) == 1  # "b" becomes least recently used
+    cache.set("c", 3, ttl)
+
+    assert cache.get("b", _MISSING) is _MISSING
+    assert cache.get("a", None) == 1
+    assert cache.get("c", None) == 3
+
+
+def test_cache_stores_none():
+    cache: TTLCache[str, int | None] = TTLCache(max_size=2)
+    cache.set("a", None, timedelta(minutes=1))
+
+    assert cache.get("a", _MISSING) is None
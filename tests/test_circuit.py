@@ -0,0 +1,75 @@
+"""Tests for the upstream circuit breaker."""
+
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.montreal_aqi.circuit import CircuitBreaker
+from custom_components.montreal_aqi.circuit import CircuitOpenError
+from custom_components.montreal_aqi.circuit import CircuitState
+from custom_components.montreal_aqi.coordinator import MontrealAQICoordinator
+
+
+async def _fail(breaker: CircuitBreaker) -> None:
+    with pytest.raises(RuntimeError):
+        async with breaker.async_guard():
+            raise RuntimeError("portal down")
+
+
+@pytest.fixture
+def clock():
+    """Control the breaker clock and disable jitter."""
+    now = [1000.0]
+    with patch(
+        "custom_components.montreal_aqi.circuit.time.monotonic",
+        side_effect=lambda: now[0],
+    ), patch(
+        "custom_components.montreal_aqi.circuit.random.uniform",
+        side_effect=lambda low, high: high,
+    ):
+        yield now
+
+
+async def test_circuit_opens_after_repeated_failures(clock):
+    breaker = CircuitBreaker("realtime")
+    for _ in range(3):
+        await _fail(breaker)
+
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.retry_after == 60
+    with pytest.raises(CircuitOpenError):
+        async with breaker.async_guard():
+            pytest.fail("call not short-circuited")
+
+
+async def test_circuit_half_open_probe(clock):
+    breaker = CircuitBreaker("realtime")
+    for _ in range(3):
+        await _fail(breaker)
+
+    # Failed probe opens the circuit again with a doubled delay
+    clock[0] += 60
+    await _fail(breaker)
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.retry_after == 120
+
+    # Successful probe closes it
+    clock[0] += 120
+    async with breaker.async_guard():
+        assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.failures == 0
+
+
+async def test_coordinator_serves_last_data_while_open(hass, mock_station_data):
+    api = AsyncMock()
+    api.async_get_station.return_value = mock_station_data
+    coordinator = MontrealAQICoordinator(hass=hass, api=api, station_id="80")
+    coordinator.data = await coordinator._async_update_data()
+
+    api.async_get_station.side_effect = CircuitOpenError("realtime", 60)
+    assert await coordinator._async_update_data() == coordinator.data.as_stale()
+    assert coordinator.metrics.consecutive_failures == 1
+    assert coordinator.stale
+    await coordinator.async_shutdown()
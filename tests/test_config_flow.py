@@ -1,10 +1,22 @@
+import asyncio
+from datetime import timedelta
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from homeassistant.config_entries import SOURCE_USER
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
 
-from custom_components.montreal_aqi.const import CONF_STATION_ID, DOMAIN
+from custom_components.montreal_aqi.const import API_URL
+from custom_components.montreal_aqi.const import CONF_STALE_GRACE
+from custom_components.montreal_aqi.const import CONF_STATION_ID
+from custom_components.montreal_aqi.const import CONF_UPDATE_DEADLINE
+from custom_components.montreal_aqi.const import DATA_TRANSPORT
+from custom_components.montreal_aqi.const import DOMAIN
+from custom_components.montreal_aqi.transport import AiohttpTransport
 
 
 @pytest.fixture
@@ -23,13 +35,13 @@ async def test_config_flow_user_step(
 ) -> None:
     """Test user step of config flow."""
     with patch(
-        "custom_components.montreal_aqi.config_flow.MontrealAQIApi"
-    ) as mock_api_class:
+        "custom_components.montreal_aqi.config_flow.async_get_api"
+    ) as mock_get_api:
         mock_api = AsyncMock()
         mock_api.async_list_stations.return_value = [
             {"station_id": "80", "name": "Downtown"},
         ]
-        mock_api_class.return_value = mock_api
+        mock_get_api.return_value = mock_api
 
         result = await hass.config_entries.flow.async_init(
             DOMAIN,
@@ -47,11 +59,11 @@ async def test_config_flow_success(
 ) -> None:
     """Test successful config flow."""
     with patch(
-        "custom_components.montreal_aqi.config_flow.MontrealAQIApi"
-    ) as mock_api_class:
+        "custom_components.montreal_aqi.config_flow.async_get_api"
+    ) as mock_get_api:
         mock_api = AsyncMock()
         mock_api.async_list_stations.return_value = mock_stations
-        mock_api_class.return_value = mock_api
+        mock_get_api.return_value = mock_api
 
         result = await hass.config_entries.flow.async_init(
             DOMAIN,
@@ -92,11 +104,11 @@ async def test_config_flow_duplicate_station(
     existing_entry.add_to_hass(hass)
 
     with patch(
-        "custom_components.montreal_aqi.config_flow.MontrealAQIApi"
-    ) as mock_api_class:
+        "custom_components.montreal_aqi.config_flow.async_get_api"
+    ) as mock_get_api:
         mock_api = AsyncMock()
         mock_api.async_list_stations.return_value = mock_stations
-        mock_api_class.return_value = mock_api
+        mock_get_api.return_value = mock_api
 
         result = await hass.config_entries.flow.async_init(
             DOMAIN,
@@ -119,11 +131,11 @@ async def test_config_flow_api_error(
 ) -> None:
     """Test config flow handles API errors."""
     with patch(
-        "custom_components.montreal_aqi.config_flow.MontrealAQIApi"
-    ) as mock_api_class:
+        "custom_components.montreal_aqi.config_flow.async_get_api"
+    ) as mock_get_api:
         mock_api = AsyncMock()
         mock_api.async_list_stations.side_effect = Exception("API error")
-        mock_api_class.return_value = mock_api
+        mock_get_api.return_value = mock_api
 
         result = await hass.config_entries.flow.async_init(
             DOMAIN,
@@ -140,11 +152,11 @@ async def test_config_flow_no_stations(
 ) -> None:
     """Test config flow when no stations available."""
     with patch(
-        "custom_components.montreal_aqi.config_flow.MontrealAQIApi"
-    ) as mock_api_class:
+        "custom_components.montreal_aqi.config_flow.async_get_api"
+    ) as mock_get_api:
         mock_api = AsyncMock()
         mock_api.async_list_stations.return_value = []
-        mock_api_class.return_value = mock_api
+        mock_get_api.return_value = mock_api
 
         result = await hass.config_entries.flow.async_init(
             DOMAIN,
@@ -161,8 +173,8 @@ async def test_config_flow_stations_sorted(
 ) -> None:
     """Test stations are sorted by numeric ID."""
     with patch(
-        "custom_components.montreal_aqi.config_flow.MontrealAQIApi"
-    ) as mock_api_class:
+        "custom_components.montreal_aqi.config_flow.async_get_api"
+    ) as mock_get_api:
         mock_api = AsyncMock()
         # Return unsorted stations
         mock_api.async_list_stations.return_value = [
@@ -170,7 +182,7 @@ async def test_config_flow_stations_sorted(
             {"station_id": "80", "name": "Downtown"},
             {"station_id": "39", "name": "East"},
         ]
-        mock_api_class.return_value = mock_api
+        mock_get_api.return_value = mock_api
 
         result = await hass.config_entries.flow.async_init(
             DOMAIN,
@@ -185,3 +197,166 @@ async def test_config_flow_stations_sorted(
 
         # Should be sorted: 39, 50, 80
         assert values == ["39", "50", "80"]
+
+
+async def test_config_flow_uses_cached_stations(
+    hass: HomeAssistant,
+    enable_custom_integrations,
+    hass_storage,
+    mock_stations: list,
+) -> None:
+    """Test the form renders from the stored station list without an API call."""
+    from homeassistant.util import dt as dt_util
+
+    from custom_components.montreal_aqi.const import STORAGE_KEY_STATIONS
+
+    hass_storage[STORAGE_KEY_STATIONS] = {
+        "version": 1,
+        "data": {
+            "fetched_at": dt_util.utcnow().isoformat(),
+            "stations": mock_stations,
+        },
+    }
+
+    with patch(
+        "custom_components.montreal_aqi.config_flow.async_get_api"
+    ) as mock_get_api:
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": SOURCE_USER},
+        )
+        await hass.async_block_till_done()
+
+        assert result["type"] == "form"
+        mock_get_api.assert_not_called()
+
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            user_input={CONF_STATION_ID: "39"},
+        )
+
+    assert result["type"] == "create_entry"
+    assert result["title"] == "East"
+
+
+async def test_config_flow_refreshes_expired_cache(
+    hass: HomeAssistant,
+    enable_custom_integrations,
+    hass_storage,
+    mock_stations: list,
+) -> None:
+    """Test an expired station list is shown and refreshed in the background."""
+    from datetime import timedelta
+
+    from homeassistant.util import dt as dt_util
+
+    from custom_components.montreal_aqi.const import STORAGE_KEY_STATIONS
+
+    hass_storage[STORAGE_KEY_STATIONS] = {
+        "version": 1,
+        "data": {
+            "fetched_at": (dt_util.utcnow() - timedelta(days=2)).isoformat(),
+            "stations": mock_stations[:1],
+        },
+    }
+
+    with patch(
+        "custom_components.montreal_aqi.config_flow.async_get_api"
+    ) as mock_get_api:
+        mock_api = AsyncMock()
+        mock_api.async_list_stations.return_value = mock_stations
+        mock_get_api.return_value = mock_api
+
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": SOURCE_USER},
+        )
+        await hass.async_block_till_done()
+
+    options = result["data_schema"].schema[CONF_STATION_ID].config["options"]
+    assert [opt["value"] for opt in options] == ["80"]
+    mock_api.async_list_stations.assert_called_once()
+    assert hass_storage[STORAGE_KEY_STATIONS]["data"]["stations"] == mock_stations
+
+
+async def test_options_flow_sets_update_timing(
+    hass: HomeAssistant,
+    enable_custom_integrations,
+    mock_config_entry,
+) -> None:
+    """Test update timing is set from the options and applied on reload."""
+    with (
+        patch(
+            "custom_components.montreal_aqi.coordinator.MontrealAQICoordinator.async_config_entry_first_refresh"
+        ),
+        patch(
+            "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups",
+            return_value=True,
+        ),
+        patch(
+            "homeassistant.config_entries.ConfigEntries.async_unload_platforms",
+            return_value=True,
+        ),
+    ):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        assert hass.data[DOMAIN][mock_config_entry.entry_id].deadline == timedelta(
+            seconds=30
+        )
+
+        result = await hass.config_entries.options.async_init(
+            mock_config_entry.entry_id
+        )
+        assert result["type"] == "form"
+        assert result["step_id"] == "init"
+
+        deadline = {"hours": 0, "minutes": 0, "seconds": 45}
+        grace = {"hours": 3, "minutes": 0, "seconds": 0}
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={
+                CONF_UPDATE_DEADLINE: {"hours": 0, "minutes": 0, "seconds": 0},
+                CONF_STALE_GRACE: grace,
+            },
+        )
+        assert result["errors"] == {CONF_UPDATE_DEADLINE: "invalid_duration"}
+
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={CONF_UPDATE_DEADLINE: deadline, CONF_STALE_GRACE: grace},
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == "create_entry"
+    assert mock_config_entry.options == {
+        CONF_UPDATE_DEADLINE: deadline,
+        CONF_STALE_GRACE: grace,
+    }
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+    assert coordinator.deadline == timedelta(seconds=45)
+    assert coordinator.stale_grace == timedelta(hours=3)
+
+
+async def test_concurrent_flows_share_api(
+    hass: HomeAssistant,
+    enable_custom_integrations,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test concurrent flows share the API client and its station list request."""
+    aioclient_mock.get(
+        API_URL,
+        json={
+            "success": True,
+            "result": {"records": [{"numero_station": "80", "nom": "Downtown"}]},
+        },
+    )
+    hass.data[DATA_TRANSPORT] = AiohttpTransport(hass, async_get_clientsession(hass))
+
+    first, second = await asyncio.gather(
+        hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_USER}),
+        hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_USER}),
+    )
+
+    assert first["type"] == "form"
+    assert second["type"] == "form"
+    assert aioclient_mock.call_count == 1
@@ -1,6 +1,13 @@
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
+import pytest
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.montreal_aqi.circuit import CircuitOpenError
 from custom_components.montreal_aqi.coordinator import MontrealAQICoordinator
+from custom_components.montreal_aqi.coordinator import MontrealAQINetworkCoordinator
 
 
 async def test_coordinator_update(hass, mock_station_data):
@@ -15,7 +22,230 @@ async def test_coordinator_update(hass, mock_station_data):
 
     data = await coordinator._async_update_data()
 
-    assert data["aqi"] == 42
-    assert data["dominant_pollutant"] == "PM2.5"
-    assert "NO2" in data["pollutants"]
-    assert data["pollutants"]["PM2.5"]["concentration"] == 12
+    assert data.aqi == 42
+    assert data.dominant_pollutant == "PM2.5"
+    assert "NO2" in data.pollutants
+    assert data.pollutants["PM2.5"] == 12
+    with pytest.raises(TypeError):
+        data.pollutants["PM2.5"] = 0
+
+
+async def test_network_coordinator_fetches_all_stations_once(
+    hass, mock_station_data
+):
+    api = AsyncMock()
+    api.async_get_stations.return_value = {
+        "80": mock_station_data,
+        "39": {**mock_station_data, "aqi": 17},
+    }
+
+    network = MontrealAQINetworkCoordinator(hass=hass, api=api)
+    network.async_add_station("80")
+    network.async_add_station("39")
+
+    station_80 = MontrealAQICoordinator(
+        hass=hass, api=api, station_id="80", network=network
+    )
+    station_39 = MontrealAQICoordinator(
+        hass=hass, api=api, station_id="39", network=network
+    )
+
+    data_80 = await station_80._async_update_data()
+    data_39 = await station_39._async_update_data()
+
+    assert data_80.aqi == 42
+    assert data_39.aqi == 17
+    api.async_get_stations.assert_called_once_with(["39", "80"])
+    api.async_get_station.assert_not_called()
+    assert station_80.update_interval is None
+
+
+async def test_station_manual_refresh_fetches_network(hass, mock_station_data):
+    api = AsyncMock()
+    api.async_get_stations.return_value = {"80": mock_station_data}
+
+    network = MontrealAQINetworkCoordinator(hass=hass, api=api)
+    network.async_add_station("80")
+    station = MontrealAQICoordinator(
+        hass=hass, api=api, station_id="80", network=network
+    )
+    unsub = network.async_add_listener(station.async_handle_network_update)
+
+    await station.async_refresh()
+    await hass.async_block_till_done()
+    assert api.async_get_stations.call_count == 1
+
+    # A manual refresh (homeassistant.update_entity) fetches upstream again
+    api.async_get_stations.return_value = {"80": {**mock_station_data, "aqi": 43}}
+    await station.async_request_refresh()
+    await hass.async_block_till_done()
+
+    assert api.async_get_stations.call_count == 2
+    assert station.data.aqi == 43
+
+    unsub()
+    await network.async_shutdown()
+
+
+async def test_network_coordinator_failure_propagates(hass):
+    api = AsyncMock()
+    api.async_get_stations.side_effect = RuntimeError("portal down")
+
+    network = MontrealAQINetworkCoordinator(hass=hass, api=api)
+    network.async_add_station("80")
+    coordinator = MontrealAQICoordinator(
+        hass=hass, api=api, station_id="80", network=network
+    )
+
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+
+
+async def test_coordinator_schedules_snapshot_save(hass, mock_station_data):
+    api = AsyncMock()
+    api.async_get_station.return_value = mock_station_data
+    snapshot_store = MagicMock()
+
+    coordinator = MontrealAQICoordinator(
+        hass=hass, api=api, station_id="80", snapshot_store=snapshot_store
+    )
+
+    data = await coordinator._async_update_data()
+
+    assert data.restored is False
+    snapshot_store.async_schedule_save.assert_called_once_with(data)
+
+
+async def test_coordinator_skips_unchanged_measurement(hass, mock_station_data):
+    api = AsyncMock()
+    api.async_get_station.return_value = mock_station_data
+    snapshot_store = MagicMock()
+    listener = MagicMock()
+
+    coordinator = MontrealAQICoordinator(
+        hass=hass, api=api, station_id="80", snapshot_store=snapshot_store
+    )
+    unsub = coordinator.async_add_listener(listener)
+
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+
+    assert listener.call_count == 1
+    snapshot_store.async_schedule_save.assert_called_once()
+
+    api.async_get_station.return_value = {**mock_station_data, "aqi": 43}
+    await coordinator.async_refresh()
+
+    assert listener.call_count == 2
+    assert coordinator.data.aqi == 43
+    unsub()
+
+
+async def test_coordinator_serves_stale_data_within_grace(
+    hass, freezer, mock_station_data
+):
+    api = AsyncMock()
+    api.async_get_station.return_value = mock_station_data
+    coordinator = MontrealAQICoordinator(hass=hass, api=api, station_id="80")
+    listener = MagicMock()
+    unsub = coordinator.async_add_listener(listener)
+
+    await coordinator.async_refresh()
+    assert coordinator.available
+    assert not coordinator.stale
+
+    api.async_get_station.side_effect = RuntimeError("portal down")
+    await coordinator.async_refresh()
+    assert coordinator.available
+    assert coordinator.stale
+    assert coordinator.data.aqi == 42
+
+    listener.reset_mock()
+    freezer.tick(coordinator.stale_grace)
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert not coordinator.available
+    listener.assert_called()
+
+    # A successful update ends the grace window
+    api.async_get_station.side_effect = None
+    await coordinator.async_refresh()
+    assert coordinator.available
+    assert not coordinator.stale
+
+    unsub()
+    await coordinator.async_shutdown()
+
+
+async def test_network_station_goes_unavailable_while_circuit_open(
+    hass, freezer, mock_station_data
+):
+    api = AsyncMock()
+    api.async_get_stations.return_value = {"80": mock_station_data}
+    network = MontrealAQINetworkCoordinator(hass=hass, api=api)
+    network.async_add_station("80")
+    coordinator = MontrealAQICoordinator(
+        hass=hass, api=api, station_id="80", network=network
+    )
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    unsub = network.async_add_listener(coordinator.async_handle_network_update)
+
+    # The network keeps its last snapshot, stations flag their reading stale
+    api.async_get_stations.side_effect = CircuitOpenError("realtime", 60)
+    await network.async_refresh()
+    await hass.async_block_till_done()
+    assert network.last_update_success
+    assert coordinator.stale
+    assert coordinator.data.stale
+    assert coordinator.available
+
+    freezer.tick(coordinator.stale_grace)
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert not coordinator.available
+
+    # The first snapshot fetched once the circuit closes makes it fresh again
+    api.async_get_stations.side_effect = None
+    await network.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.available
+    assert not coordinator.data.stale
+
+    unsub()
+    await coordinator.async_shutdown()
+    await network.async_shutdown()
+
+
+async def test_coordinator_serves_stale_reading_while_circuit_open(
+    hass, mock_station_data
+):
+    api = AsyncMock()
+    api.async_get_station.return_value = mock_station_data
+    coordinator = MontrealAQICoordinator(hass=hass, api=api, station_id="80")
+    listener = MagicMock()
+    unsub = coordinator.async_add_listener(listener)
+
+    await coordinator.async_refresh()
+    assert not coordinator.data.stale
+    listener.reset_mock()
+
+    api.async_get_station.side_effect = CircuitOpenError("realtime", 60)
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+
+    # Listeners learn about the stale reading once, through the update itself
+    assert coordinator.last_update_success
+    assert coordinator.stale
+    assert coordinator.data.stale
+    assert coordinator.data.aqi == 42
+    listener.assert_called_once()
+
+    api.async_get_station.side_effect = None
+    await coordinator.async_refresh()
+    assert not coordinator.stale
+    assert not coordinator.data.stale
+    assert listener.call_count == 2
+
+    unsub()
+    await coordinator.async_shutdown()
@@ -1,12 +1,19 @@
 """Tests for Coordinator error handling."""
 
+import asyncio
+from datetime import timedelta
 from unittest.mock import AsyncMock
 
 import pytest
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import UpdateFailed
 
+from custom_components.montreal_aqi.api import ExecutorLimit
+from custom_components.montreal_aqi.api import MontrealAQIApi
+from custom_components.montreal_aqi.const import DATA_FETCH_LIMIT
+from custom_components.montreal_aqi.const import DEFAULT_UPDATE_DEADLINE
 from custom_components.montreal_aqi.coordinator import MontrealAQICoordinator
+from custom_components.montreal_aqi.coordinator import MontrealAQINetworkCoordinator
 
 
 async def test_coordinator_api_error(hass: HomeAssistant) -> None:
@@ -79,8 +86,8 @@ async def test_coordinator_invalid_timestamp(hass: HomeAssistant) -> None:
     )
 
     data = await coordinator._async_update_data()
-    assert data["aqi"] == 42
-    assert data["timestamp"] is None
+    assert data.aqi == 42
+    assert data.timestamp is None
 
 
 async def test_coordinator_invalid_pollutant_value(hass: HomeAssistant) -> None:
@@ -104,9 +111,9 @@ async def test_coordinator_invalid_pollutant_value(hass: HomeAssistant) -> None:
     )
 
     data = await coordinator._async_update_data()
-    assert data["pollutants"]["PM2.5"]["concentration"] is None
+    assert data.pollutants["PM2.5"] is None
     # NO2 is converted from PPB to µg/m³: 30 * (46.01/24.45) ≈ 56
-    assert data["pollutants"]["NO2"]["concentration"] == 56
+    assert data.pollutants["NO2"] == 56
 
 
 async def test_coordinator_null_pollutant_value(hass: HomeAssistant) -> None:
@@ -131,9 +138,9 @@ async def test_coordinator_null_pollutant_value(hass: HomeAssistant) -> None:
     )
 
     data = await coordinator._async_update_data()
-    assert data["pollutants"]["PM2.5"]["concentration"] is None
+    assert data.pollutants["PM2.5"] is None
     # NO2 is converted from PPB to µg/m³: 30 * (46.01/24.45) ≈ 56
-    assert data["pollutants"]["NO2"]["concentration"] == 56
+    assert data.pollutants["NO2"] == 56
 
 
 async def test_coordinator_insufficient_pollutants_one(hass: HomeAssistant) -> None:
@@ -212,8 +219,8 @@ async def test_coordinator_sufficient_pollutants_three(hass: HomeAssistant) -> N
     )
 
     data = await coordinator._async_update_data()
-    assert data["aqi"] == 42
-    assert len(data["pollutants"]) == 3
+    assert data.aqi == 42
+    assert len(data.pollutants) == 3
 
 
 async def test_coordinator_pollutants_with_null_values(hass: HomeAssistant) -> None:
@@ -273,13 +280,41 @@ async def test_coordinator_insufficient_pollutants_with_fallback_success(
 
     data = await coordinator._async_update_data()
     # Should use fallback AQI instead of rejecting
-    assert data["aqi"] == 55
-    assert data["dominant_pollutant"] == "O3"
+    assert data.aqi == 55
+    assert data.dominant_pollutant == "O3"
     # Fallback was called due to insufficient primary data
     # Hour "13" is extracted from timestamp "2025-01-15T13:00:00"
     api.async_get_aqi_fallback.assert_called_once_with("80", "13")
 
 
+async def test_coordinator_key_pollutants_computed_locally(
+    hass: HomeAssistant,
+) -> None:
+    """Test the AQI is computed locally when PM2.5 and O3 are measured."""
+    api = AsyncMock()
+    api.async_get_station.return_value = {
+        "aqi": 42,
+        "dominant_pollutant": "PM2.5",
+        "pollutants": {
+            "PM2.5": {"aqi": 42, "concentration": 14.7},
+            "O3": {"aqi": 50, "concentration": 80.0},
+        },
+        "timestamp": "2025-01-15T13:00:00",
+    }
+
+    coordinator = MontrealAQICoordinator(
+        hass=hass,
+        api=api,
+        station_id="80",
+    )
+
+    data = await coordinator._async_update_data()
+    assert data.aqi == 50
+    assert data.dominant_pollutant == "O3"
+    assert data.sub_indices == {"PM2.5": 42, "O3": 50}
+    api.async_get_aqi_fallback.assert_not_called()
+
+
 async def test_coordinator_insufficient_pollutants_fallback_unavailable(
     hass: HomeAssistant,
 ) -> None:
@@ -307,3 +342,111 @@ async def test_coordinator_insufficient_pollutants_fallback_unavailable(
 
     assert "Insufficient pollutant data" in str(exc_info.value)
     assert "Fallback AQI source also unavailable" in str(exc_info.value)
+
+
+async def test_coordinator_deadline_overrun(hass: HomeAssistant) -> None:
+    """Test a hanging fetch is abandoned at the deadline and counted."""
+    api = AsyncMock()
+
+    async def _hang(_station_id):
+        await asyncio.sleep(3600)
+
+    api.async_get_station.side_effect = _hang
+
+    coordinator = MontrealAQICoordinator(hass=hass, api=api, station_id="80")
+    coordinator.deadline = timedelta(milliseconds=10)
+
+    with pytest.raises(UpdateFailed, match="deadline"):
+        await coordinator._async_update_data()
+
+    assert coordinator.metrics.deadline_overruns == 1
+    assert coordinator.metrics.consecutive_failures == 1
+
+
+async def test_network_deadline_follows_stations(hass: HomeAssistant) -> None:
+    """Test the network budget is the longest deadline of its stations."""
+    network = MontrealAQINetworkCoordinator(hass=hass, api=AsyncMock())
+    assert network.deadline == DEFAULT_UPDATE_DEADLINE
+
+    network.async_add_station("80", timedelta(seconds=10))
+    assert network.deadline == timedelta(seconds=10)
+
+    network.async_add_station("39", timedelta(seconds=90))
+    assert network.deadline == timedelta(seconds=90)
+
+    network.async_remove_station("39")
+    assert network.deadline == timedelta(seconds=10)
+
+    network.async_remove_station("80")
+    assert network.deadline == DEFAULT_UPDATE_DEADLINE
+
+
+async def test_network_deadline_overrun(hass: HomeAssistant) -> None:
+    """Test the network abandons a fetch overrunning the station deadline."""
+    api = AsyncMock()
+
+    async def _hang(_station_ids):
+        await asyncio.sleep(3600)
+
+    api.async_get_stations.side_effect = _hang
+    network = MontrealAQINetworkCoordinator(hass=hass, api=api)
+    network.async_add_station("80", timedelta(milliseconds=10))
+
+    with pytest.raises(UpdateFailed, match="deadline"):
+        await network._async_update_data()
+
+    assert network.deadline_overruns == 1
+
+
+async def test_station_deadline_does_not_cancel_network_refresh(
+    hass: HomeAssistant, mock_station_data
+) -> None:
+    """Test a station overrunning its deadline leaves the shared fetch running."""
+    release = asyncio.Event()
+    api = AsyncMock()
+
+    async def _slow_stations(station_ids):
+        await release.wait()
+        return {station_id: mock_station_data for station_id in station_ids}
+
+    api.async_get_stations.side_effect = _slow_stations
+    network = MontrealAQINetworkCoordinator(hass=hass, api=api)
+    network.async_add_station("80")
+    network.async_add_station("39")
+    hasty = MontrealAQICoordinator(hass, api, "80", network=network)
+    hasty.deadline = timedelta(milliseconds=10)
+    patient = MontrealAQICoordinator(hass, api, "39", network=network)
+
+    waiting = asyncio.create_task(patient._async_update_data())
+    with pytest.raises(UpdateFailed, match="deadline"):
+        await hasty._async_update_data()
+
+    release.set()
+    reading = await waiting
+
+    assert reading.aqi == 42
+    assert api.async_get_stations.call_count == 1
+    assert network.last_update_success
+
+
+async def test_abandoned_library_call_keeps_slot(hass: HomeAssistant) -> None:
+    """Test an abandoned blocking call holds its slot until it finishes."""
+    hass.data[DATA_FETCH_LIMIT] = ExecutorLimit(1)
+    api = MontrealAQIApi(hass, use_library=True)
+    slots = api.executor_limit.slots
+    done = asyncio.Event()
+
+    async def _hanging_executor_job(target, *args):
+        await done.wait()
+        return target(*args)
+
+    hass.async_add_executor_job = _hanging_executor_job
+
+    with pytest.raises(TimeoutError):
+        async with asyncio.timeout(0.01):
+            await api._async_add_executor_job(str, 1)
+    assert slots.locked()
+
+    done.set()
+    async with asyncio.timeout(1):
+        await slots.acquire()
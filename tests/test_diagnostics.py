@@ -0,0 +1,73 @@
+"""Tests for Montreal AQI diagnostics."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from custom_components.montreal_aqi.api import MontrealAQIApi
+from custom_components.montreal_aqi.const import API_URL
+from custom_components.montreal_aqi.const import DOMAIN
+from custom_components.montreal_aqi.coordinator import MontrealAQICoordinator
+from custom_components.montreal_aqi.coordinator import MontrealAQINetworkCoordinator
+from custom_components.montreal_aqi.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.montreal_aqi.metrics import CycleHistory
+
+RECORDS = [
+    {"stationId": "80", "date": "2025-01-15", "heure": "13", "pollutant": "PM", "valeur": "42"},
+    {"stationId": "80", "date": "2025-01-15", "heure": "13", "pollutant": "O3", "valeur": "20"},
+    {"stationId": "80", "date": "2025-01-15", "heure": "13", "pollutant": "NO2", "valeur": "8"},
+]
+
+
+async def test_diagnostics_include_cycle_timings(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, mock_config_entry
+):
+    aioclient_mock.get(
+        API_URL, json={"success": True, "result": {"records": RECORDS}}
+    )
+    api = MontrealAQIApi(hass, session=async_get_clientsession(hass))
+    network = MontrealAQINetworkCoordinator(hass, api)
+    network.async_add_station("80")
+    coordinator = MontrealAQICoordinator(hass, api, "80", network=network)
+    hass.data.setdefault(DOMAIN, {})[mock_config_entry.entry_id] = coordinator
+
+    await coordinator.async_refresh()
+    diagnostics = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+    await network.async_shutdown()
+
+    station = diagnostics["station"]
+    assert station["reading"]["aqi"] == 42
+    assert station["metrics"]["updates"] == 1
+    assert station["metrics"]["bytes_received"] > 0
+    assert len(station["cycles"]) == 1
+    assert set(station["cycles"][0]) == {
+        "started",
+        "total_ms",
+        "executor_wait_ms",
+        "http_ms",
+        "parse_ms",
+        "fallback_ms",
+        "entity_write_ms",
+    }
+
+    assert diagnostics["network"]["station_ids"] == ["80"]
+    network_cycle = network.cycles.cycles[0]
+    assert network_cycle.http > 0
+    assert network_cycle.parse > 0
+    assert network_cycle.executor_wait == 0
+
+
+def test_cycle_history_is_bounded():
+    history = CycleHistory(size=2)
+    for _ in range(3):
+        with history.measure():
+            pass
+
+    history.record_entity_write(0.5)
+
+    assert len(history.as_list()) == 2
+    assert history.cycles[-1].entity_write == 0.5
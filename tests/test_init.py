@@ -137,3 +137,177 @@ async def test_setup_entry_failure(
     assert mock_config_entry.state is ConfigEntryState.SETUP_ERROR
 
     assert DOMAIN not in hass.data
+
+
+async def test_network_shared_and_released(
+    hass: HomeAssistant,
+    enable_custom_integrations,
+    mock_config_entry,
+):
+    """Test the network coordinator is shared and shut down with the last entry."""
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from custom_components.montreal_aqi.const import CONF_STATION_ID
+    from custom_components.montreal_aqi.const import DATA_NETWORK
+
+    second_entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Station 39",
+        data={CONF_STATION_ID: "39"},
+        unique_id="station_39",
+    )
+    second_entry.add_to_hass(hass)
+
+    with (
+        patch(
+            "custom_components.montreal_aqi.coordinator.MontrealAQICoordinator.async_config_entry_first_refresh"
+        ),
+        patch(
+            "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups",
+            return_value=True,
+        ),
+        patch(
+            "homeassistant.config_entries.ConfigEntries.async_unload_platforms",
+            return_value=True,
+        ),
+    ):
+        # Setting up the domain loads both entries
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        assert second_entry.state is ConfigEntryState.LOADED
+
+        network = hass.data[DATA_NETWORK]
+        assert network.station_ids == {"80", "39"}
+        assert hass.data[DOMAIN][mock_config_entry.entry_id].network is network
+        assert hass.data[DOMAIN][second_entry.entry_id].network is network
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+        assert hass.data[DATA_NETWORK] is network
+        assert network.station_ids == {"39"}
+
+        assert await hass.config_entries.async_unload(second_entry.entry_id)
+        await hass.async_block_till_done()
+        assert DATA_NETWORK not in hass.data
+
+
+async def test_setup_restores_snapshot(
+    hass: HomeAssistant,
+    enable_custom_integrations,
+    mock_config_entry,
+    hass_storage,
+):
+    """Test a stored snapshot is served at setup without a blocking refresh."""
+    hass_storage["montreal_aqi.snapshot.80"] = {
+        "version": 1,
+        "data": {
+            "aqi": 33,
+            "dominant_pollutant": "O3",
+            "pollutants": {"O3": 40},
+            "timestamp": "2025-01-15T13:50:00-05:00",
+        },
+    }
+
+    with (
+        patch(
+            "custom_components.montreal_aqi.coordinator.MontrealAQICoordinator.async_config_entry_first_refresh"
+        ) as first_refresh,
+        patch(
+            "custom_components.montreal_aqi.coordinator.MontrealAQICoordinator.async_refresh"
+        ) as background_refresh,
+        patch(
+            "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups",
+            return_value=True,
+        ),
+    ):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    first_refresh.assert_not_called()
+    background_refresh.assert_called_once()
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+    assert coordinator.data.aqi == 33
+    assert coordinator.data.restored is True
+    assert coordinator.data.timestamp.hour == 13
+
+
+async def test_remove_entry_deletes_snapshot(
+    hass: HomeAssistant,
+    enable_custom_integrations,
+    mock_config_entry,
+    hass_storage,
+):
+    """Test removing an entry deletes its stored snapshot and statistics."""
+    hass_storage["montreal_aqi.snapshot.80"] = {
+        "version": 1,
+        "data": {"aqi": 33, "pollutants": {}, "timestamp": None},
+    }
+    hass_storage["montreal_aqi.rolling.80"] = {
+        "version": 1,
+        "data": {"O3": {"hour": 482000, "values": [40.0]}},
+    }
+
+    assert await hass.config_entries.async_remove(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert "montreal_aqi.snapshot.80" not in hass_storage
+    assert "montreal_aqi.rolling.80" not in hass_storage
+
+
+async def test_file_logging_set_up_once(
+    hass: HomeAssistant,
+    enable_custom_integrations,
+    mock_config_entry,
+):
+    """Test one queue handler is shared by all entries and removed at the end."""
+    import logging
+    import logging.handlers
+
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from custom_components.montreal_aqi.const import CONF_STATION_ID
+    from custom_components.montreal_aqi.const import DATA_LOGGING
+
+    package_logger = logging.getLogger("custom_components.montreal_aqi")
+
+    def _queue_handlers():
+        return [
+            handler
+            for handler in package_logger.handlers
+            if isinstance(handler, logging.handlers.QueueHandler)
+        ]
+
+    second_entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Station 39",
+        data={CONF_STATION_ID: "39"},
+        unique_id="station_39",
+    )
+    second_entry.add_to_hass(hass)
+
+    with (
+        patch(
+            "custom_components.montreal_aqi.coordinator.MontrealAQICoordinator.async_config_entry_first_refresh"
+        ),
+        patch(
+            "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups",
+            return_value=True,
+        ),
+        patch(
+            "homeassistant.config_entries.ConfigEntries.async_unload_platforms",
+            return_value=True,
+        ),
+    ):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert len(_queue_handlers()) == 1
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+        assert len(_queue_handlers()) == 1
+
+        assert await hass.config_entries.async_unload(second_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert _queue_handlers() == []
+    assert DATA_LOGGING not in hass.data
@@ -0,0 +1,88 @@
+"""Tests for fetch metrics."""
+
+import asyncio
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.montreal_aqi.coordinator import MontrealAQICoordinator
+from custom_components.montreal_aqi.coordinator import MontrealAQINetworkCoordinator
+from custom_components.montreal_aqi.metrics import StationMetrics
+
+
+def test_latency_percentiles():
+    metrics = StationMetrics()
+    assert metrics.latency_p50 is None
+
+    for duration in (0.5, 0.1, 0.4, 0.2, 0.3):
+        metrics.record_fetch(duration)
+
+    assert metrics.last_fetch_duration == 0.3
+    assert metrics.latency_p50 == 0.3
+    assert metrics.latency_p95 == 0.5
+
+
+def test_results_and_fallback_ratio():
+    metrics = StationMetrics()
+    listener = MagicMock()
+    unsub = metrics.async_add_listener(listener)
+    assert metrics.fallback_ratio is None
+
+    metrics.record_fallback()
+    metrics.async_record_result(success=False)
+    metrics.async_record_result(success=False)
+    assert metrics.consecutive_failures == 2
+
+    metrics.async_record_result(success=True)
+    metrics.async_record_result(success=True)
+    assert metrics.consecutive_failures == 0
+    assert metrics.fallback_ratio == 0.25
+    assert listener.call_count == 4
+
+    unsub()
+    metrics.async_record_result(success=True)
+    assert listener.call_count == 4
+
+
+async def test_coordinator_records_metrics(hass, mock_station_data):
+    api = AsyncMock()
+    api.async_get_station.return_value = mock_station_data
+    coordinator = MontrealAQICoordinator(hass=hass, api=api, station_id="80")
+
+    await coordinator._async_update_data()
+    assert coordinator.metrics.updates == 1
+    assert coordinator.metrics.last_fetch_duration is not None
+
+    api.async_get_station.side_effect = RuntimeError("portal down")
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+
+    assert coordinator.metrics.consecutive_failures == 1
+    assert coordinator.metrics.fallback_ratio == 0
+
+
+async def test_network_station_records_upstream_fetch(hass, mock_station_data):
+    async def _async_get_stations(station_ids):
+        await asyncio.sleep(0.05)
+        return {"80": mock_station_data}
+
+    api = AsyncMock()
+    api.async_get_stations.side_effect = _async_get_stations
+    network = MontrealAQINetworkCoordinator(hass=hass, api=api)
+    network.async_add_station("80")
+    coordinator = MontrealAQICoordinator(
+        hass=hass, api=api, station_id="80", network=network
+    )
+
+    await coordinator._async_update_data()
+    assert network.fetch_duration >= 0.05
+    assert coordinator.metrics.last_fetch_duration == network.fetch_duration
+
+    # Reprocessing the cached snapshot records the fetch behind it again,
+    # not the time spent reading the cache
+    network.fetch_duration = 0.2
+    await coordinator._async_update_data()
+    assert api.async_get_stations.call_count == 1
+    assert coordinator.metrics.last_fetch_duration == 0.2
@@ -0,0 +1,107 @@
+"""Tests for the rolling pollutant statistics."""
+
+from datetime import datetime
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+from custom_components.montreal_aqi.coordinator import MontrealAQICoordinator
+from custom_components.montreal_aqi.models import StationReading
+from custom_components.montreal_aqi.rolling import HourlyRingBuffer
+from custom_components.montreal_aqi.rolling import StationRollingStats
+
+
+def test_ring_buffer_rolling_windows():
+    buffer = HourlyRingBuffer()
+    for hour in range(30):
+        assert buffer.add(hour, float(hour))
+
+    assert buffer.mean(1) == 29
+    assert buffer.mean(8) == sum(range(22, 30)) / 8
+    assert buffer.mean(24) == sum(range(6, 30)) / 24
+    assert buffer.max(24) == 29
+
+    # Older or repeated hours are ignored
+    assert not buffer.add(29, 100.0)
+
+
+def test_ring_buffer_gaps_and_maximum():
+    buffer = HourlyRingBuffer()
+    buffer.add(0, 50.0)
+    buffer.add(1, None)
+    buffer.add(5, 10.0)
+
+    assert buffer.mean(8) == 30
+    assert buffer.max(8) == 50
+    assert buffer.max(1) == 10
+
+    # The peak leaves the 8h window, hours 6 to 8 count as missing
+    buffer.add(9, 20.0)
+    assert buffer.max(8) == 20
+    assert buffer.mean(8) == 15
+
+    # Gap longer than the buffer starts over
+    buffer.add(100, 5.0)
+    assert buffer.mean(24) == 5
+
+
+def test_ring_buffer_round_trip():
+    buffer = HourlyRingBuffer()
+    for hour in range(40):
+        buffer.add(hour, None if hour % 5 == 0 else float(hour % 7))
+
+    restored = HourlyRingBuffer.from_dict(buffer.as_dict())
+    assert restored.hour == buffer.hour
+    for hours in (1, 8, 24):
+        assert restored.mean(hours) == buffer.mean(hours)
+        assert restored.max(hours) == buffer.max(hours)
+
+
+async def test_coordinator_updates_rolling_stats(hass, mock_station_data):
+    api = AsyncMock()
+    api.async_get_station.return_value = mock_station_data
+    rolling_store = AsyncMock()
+    rolling_store.async_schedule_save = lambda stats: saved.append(stats)
+    saved: list[StationRollingStats] = []
+    coordinator = MontrealAQICoordinator(
+        hass=hass, api=api, station_id="80", rolling_store=rolling_store
+    )
+
+    coordinator.data = await coordinator._async_update_data()
+    assert coordinator.rolling.mean("PM2.5", 8) == 12
+    assert saved == [coordinator.rolling]
+
+    # Next hour
+    api.async_get_station.return_value = {
+        **mock_station_data,
+        "pollutants": {"PM2.5": {"concentration": 20}},
+        "timestamp": "2025-01-15T14:00:00",
+    }
+    api.async_get_aqi_fallback.return_value = {"aqi": 57, "dominant_pollutant": "PM2.5"}
+    coordinator.data = await coordinator._async_update_data()
+    assert coordinator.rolling.mean("PM2.5", 8) == 16
+    assert coordinator.rolling.max("PM2.5", 1) == 20
+    assert coordinator.rolling.max("NO2", 1) is None
+    assert len(saved) == 2
+
+
+def test_station_stats_skip_readings_without_timestamp():
+    stats = StationRollingStats()
+    start = datetime(2025, 1, 15, 13, 50)
+
+    assert stats.add_reading(
+        StationReading(aqi=20, dominant_pollutant="O3", pollutants={"O3": 40})
+    ) is False
+    assert stats.add_reading(
+        StationReading(
+            aqi=20, dominant_pollutant="O3", pollutants={"O3": 40}, timestamp=start
+        )
+    )
+    assert not stats.add_reading(
+        StationReading(
+            aqi=25,
+            dominant_pollutant="O3",
+            pollutants={"O3": 50},
+            timestamp=start + timedelta(minutes=5),
+        )
+    )
+    assert stats.mean("O3", 24) == 40
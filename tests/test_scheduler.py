@@ -0,0 +1,50 @@
+"""Tests for the publication-aligned scheduler."""
+
+from datetime import UTC, datetime, timedelta
+
+from custom_components.montreal_aqi.const import UPDATE_INTERVAL
+from custom_components.montreal_aqi.scheduler import PublicationScheduler
+
+MEASUREMENT = datetime(2025, 1, 15, 13, 0, tzinfo=UTC)
+
+
+def test_unknown_measurement_uses_update_interval():
+    scheduler = PublicationScheduler()
+
+    assert scheduler.next_interval(None) == UPDATE_INTERVAL
+
+
+def test_polls_right_after_next_publication():
+    scheduler = PublicationScheduler()
+    now = datetime(2025, 1, 15, 13, 55, tzinfo=UTC)
+
+    # Hour 14 is expected at 14:50, polled 2 minutes later
+    assert scheduler.next_interval(MEASUREMENT, now) == timedelta(minutes=57)
+
+
+def test_retries_with_backoff_then_waits_next_hour():
+    scheduler = PublicationScheduler()
+    scheduler.next_interval(MEASUREMENT, datetime(2025, 1, 15, 13, 55, tzinfo=UTC))
+
+    now = datetime(2025, 1, 15, 14, 52, tzinfo=UTC)
+    delays = [scheduler.next_interval(MEASUREMENT, now) for _ in range(4)]
+
+    assert delays[:3] == [
+        timedelta(minutes=2),
+        timedelta(minutes=5),
+        timedelta(minutes=10),
+    ]
+    # Retries exhausted: wait for hour 15, expected at 15:52
+    assert delays[3] == timedelta(hours=1)
+
+
+def test_new_measurement_resets_retries():
+    scheduler = PublicationScheduler()
+    scheduler.next_interval(MEASUREMENT, datetime(2025, 1, 15, 13, 55, tzinfo=UTC))
+    scheduler.next_interval(MEASUREMENT, datetime(2025, 1, 15, 14, 52, tzinfo=UTC))
+
+    newer = MEASUREMENT + timedelta(hours=1)
+    now = datetime(2025, 1, 15, 14, 54, tzinfo=UTC)
+
+    assert scheduler.next_interval(newer, now) == timedelta(minutes=58)
+    assert scheduler.last_measurement == newer
@@ -1,12 +1,13 @@
 from unittest.mock import AsyncMock
 
+from custom_components.montreal_aqi.models import StationReading
 from custom_components.montreal_aqi.sensor import MontrealAQILevelSensor
 
 
 def _make_coordinator(aqi):
     coordinator = AsyncMock()
     coordinator.last_update_success = True
-    coordinator.data = {"aqi": aqi}
+    coordinator.data = StationReading(aqi=aqi, dominant_pollutant=None)
     return coordinator
 
 
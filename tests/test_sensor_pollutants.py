@@ -1,13 +1,18 @@
 from unittest.mock import AsyncMock
 
 from custom_components.montreal_aqi.const import DEVICE_CLASS_MAP
+from custom_components.montreal_aqi.models import StationReading
+from custom_components.montreal_aqi.rolling import StationRollingStats
 from custom_components.montreal_aqi.sensor import MontrealAQIPollutantSensor
+from custom_components.montreal_aqi.sensor import MontrealAQIRollingSensor
 
 
 async def test_pollutant_sensor_unique_id(device_info, mock_config_entry):
     coordinator = AsyncMock()
     coordinator.last_update_success = True
-    coordinator.data = {"pollutants": {"NO2": {"concentration": 15}}}
+    coordinator.data = StationReading(
+        aqi=15, dominant_pollutant="NO2", pollutants={"NO2": 15}, sub_indices={"NO2": 4}
+    )
 
     meta = {
         "key": "no2",
@@ -26,13 +31,49 @@ async def test_pollutant_sensor_unique_id(device_info, mock_config_entry):
     )
 
     assert sensor.native_value == 15
+    assert sensor.extra_state_attributes["sub_index"] == 4
     assert sensor.unique_id.endswith("_no2")
 
 
 async def test_pollutant_not_created_if_missing():
-    data = {"pollutants": {"PM2.5": {"concentration": 10}}}
+    data = StationReading(aqi=10, dominant_pollutant="PM2.5", pollutants={"PM2.5": 10})
 
-    created_codes = [code for code in DEVICE_CLASS_MAP if code in data["pollutants"]]
+    created_codes = [code for code in DEVICE_CLASS_MAP if code in data.pollutants]
 
     assert "CO" not in created_codes
     assert "PM2.5" in created_codes
+
+
+async def test_rolling_sensor(device_info):
+    coordinator = AsyncMock()
+    coordinator.rolling = StationRollingStats.from_dict(
+        {"O3": {"hour": 482000, "values": [30.0, None, 60.0]}}
+    )
+    meta = DEVICE_CLASS_MAP["O3"]
+
+    mean = MontrealAQIRollingSensor(
+        coordinator=coordinator,
+        device_info=device_info("80"),
+        entry_id="",
+        station_id="80",
+        code="O3",
+        meta=meta,
+        hours=8,
+        stat="mean",
+    )
+    maximum = MontrealAQIRollingSensor(
+        coordinator=coordinator,
+        device_info=device_info("80"),
+        entry_id="",
+        station_id="80",
+        code="O3",
+        meta=meta,
+        hours=1,
+        stat="max",
+    )
+
+    assert mean.native_value == 45
+    assert mean.entity_registry_enabled_default
+    assert mean.unique_id.endswith("_o3_mean_8h")
+    assert maximum.native_value == 60
+    assert not maximum.entity_registry_enabled_default
@@ -0,0 +1,99 @@
+"""Tests for Montreal AQI services."""
+
+from datetime import date
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.montreal_aqi.const import DOMAIN, SERVICE_BACKFILL
+from custom_components.montreal_aqi.services import async_setup_services
+
+HISTORY = [
+    {
+        "timestamp": "2025-01-14T22:00:00-05:00",
+        "aqi": 10,
+        "dominant_pollutant": "NO2",
+        "pollutants": {"NO2": {"name": "NO2", "aqi": 10, "concentration": 40.0}},
+    },
+    {
+        "timestamp": "2025-01-14T23:00:00-05:00",
+        "aqi": 30,
+        "dominant_pollutant": "PM2.5",
+        "pollutants": {
+            "PM2.5": {"name": "PM2.5", "aqi": 30, "concentration": 10.5},
+            "NO2": {"name": "NO2", "aqi": 5, "concentration": 20.0},
+        },
+    },
+]
+
+
+async def test_backfill_imports_statistics_in_batches(
+    hass: HomeAssistant, mock_config_entry, monkeypatch
+):
+    api = AsyncMock()
+    api.async_get_station_history.return_value = HISTORY
+    monkeypatch.setattr(
+        "custom_components.montreal_aqi.statistics.STATISTICS_IMPORT_BATCH_SIZE", 1
+    )
+    async_setup_services(hass)
+
+    with (
+        patch("custom_components.montreal_aqi.api.MontrealAQIApi", return_value=api),
+        patch(
+            "custom_components.montreal_aqi.statistics.async_add_external_statistics"
+        ) as add_statistics,
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_BACKFILL,
+            {"station_id": "80", "start_date": "2025-01-14", "end_date": "2025-01-14"},
+            blocking=True,
+        )
+
+    api.async_get_station_history.assert_called_once_with(
+        "80", date(2025, 1, 14), date(2025, 1, 14)
+    )
+    calls = {}
+    for call in add_statistics.call_args_list:
+        _, metadata, statistics = call.args
+        assert metadata["source"] == DOMAIN
+        calls.setdefault(metadata["statistic_id"], []).extend(statistics)
+
+    assert sorted(calls) == [
+        "montreal_aqi:station_80_aqi",
+        "montreal_aqi:station_80_no2",
+        "montreal_aqi:station_80_pm25",
+    ]
+    assert add_statistics.call_count == 5
+    assert [s["mean"] for s in calls["montreal_aqi:station_80_aqi"]] == [10, 30]
+    # Same µg/m³ conversion as the live sensors
+    assert [s["mean"] for s in calls["montreal_aqi:station_80_no2"]] == [75, 38]
+    assert calls["montreal_aqi:station_80_pm25"][0]["start"].hour == 23
+
+
+async def test_backfill_rejects_unconfigured_station(
+    hass: HomeAssistant, mock_config_entry
+):
+    async_setup_services(hass)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_BACKFILL,
+            {"station_id": "39", "start_date": "2025-01-14"},
+            blocking=True,
+        )
+
+
+async def test_backfill_rejects_inverted_range(hass: HomeAssistant, mock_config_entry):
+    async_setup_services(hass)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_BACKFILL,
+            {"station_id": "80", "start_date": "2025-01-15", "end_date": "2025-01-14"},
+            blocking=True,
+        )
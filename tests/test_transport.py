@@ -0,0 +1,111 @@
+"""Tests for the record/replay transports."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from custom_components.montreal_aqi.api import MontrealAQIApi
+from custom_components.montreal_aqi.const import API_URL
+from custom_components.montreal_aqi.const import DATA_TRANSPORT
+from custom_components.montreal_aqi.const import DOMAIN
+from custom_components.montreal_aqi.const import RECORDING_SAVE_DELAY
+from custom_components.montreal_aqi.transport import AiohttpTransport
+from custom_components.montreal_aqi.transport import MontrealAQIReplayError
+from custom_components.montreal_aqi.transport import RecordingTransport
+from custom_components.montreal_aqi.transport import ReplayTransport
+
+RECORDS = [
+    {"stationId": "80", "date": "2025-01-15", "heure": "13", "pollutant": "PM", "valeur": "42"},
+    {"stationId": "80", "date": "2025-01-15", "heure": "13", "pollutant": "O3", "valeur": "20"},
+    {"stationId": "80", "date": "2025-01-15", "heure": "13", "pollutant": "NO2", "valeur": "8"},
+]
+
+
+async def test_record_then_replay(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, tmp_path
+):
+    """Test recorded responses replay through the full parse path offline."""
+    aioclient_mock.get(
+        API_URL, json={"success": True, "result": {"records": RECORDS}}
+    )
+    path = tmp_path / "recording.json"
+    recorder = RecordingTransport(
+        hass, AiohttpTransport(hass, async_get_clientsession(hass)), path
+    )
+    live = await MontrealAQIApi(hass, transport=recorder).async_get_station("80")
+    await recorder.async_save()
+
+    replay = await ReplayTransport.async_from_file(hass, path)
+    api = MontrealAQIApi(hass, transport=replay)
+
+    assert await api.async_get_station("80") == live
+    assert replay.bytes_received == recorder.bytes_received > 0
+    # The last recorded response keeps being served
+    assert await api.async_get_station("80") == live
+    assert aioclient_mock.call_count == 1
+
+    with pytest.raises(MontrealAQIReplayError):
+        await api.async_get_station("39")
+
+
+async def test_recording_is_bounded_and_flushed(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, tmp_path
+):
+    """Test the recording keeps the last responses and is written after a delay."""
+    aioclient_mock.get(
+        API_URL, json={"success": True, "result": {"records": RECORDS}}
+    )
+    path = tmp_path / "recording.json"
+    transport = AiohttpTransport(hass, async_get_clientsession(hass))
+    with patch(
+        "custom_components.montreal_aqi.transport.RECORDING_MAX_EXCHANGES", 2
+    ):
+        recorder = RecordingTransport(hass, transport, path)
+    for offset in range(3):
+        await recorder.async_get_json(API_URL, {"offset": str(offset)})
+    await hass.async_block_till_done()
+    assert not path.exists()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + RECORDING_SAVE_DELAY)
+    await hass.async_block_till_done()
+
+    exchanges = json.loads(path.read_text())["exchanges"]
+    assert [exchange["params"]["offset"] for exchange in exchanges] == ["1", "2"]
+
+
+async def test_replay_serves_responses_in_order(hass: HomeAssistant):
+    """Test responses recorded for the same request are served in order."""
+    params = {"resource_id": "r"}
+    replay = ReplayTransport(
+        [
+            {"url": API_URL, "params": params, "latency": 0.0, "payload": 1},
+            {"url": API_URL, "params": params, "latency": 0.0, "payload": 2},
+        ],
+        replay_latency=True,
+    )
+
+    assert await replay.async_get_json(API_URL, params) == 1
+    assert await replay.async_get_json(API_URL, params) == 2
+    assert await replay.async_get_json(API_URL, params) == 2
+
+
+async def test_yaml_replay_transport_used_by_default(
+    hass: HomeAssistant, enable_custom_integrations, tmp_path
+):
+    """Test a replay file configured in YAML is used by new API clients."""
+    path = tmp_path / "recording.json"
+    path.write_text(json.dumps({"version": 1, "exchanges": []}))
+
+    assert await async_setup_component(hass, DOMAIN, {DOMAIN: {"replay": str(path)}})
+
+    assert isinstance(hass.data[DATA_TRANSPORT], ReplayTransport)
+    assert MontrealAQIApi(hass).transport is hass.data[DATA_TRANSPORT]